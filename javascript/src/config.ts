@@ -1,3 +1,34 @@
+/**
+ * Connection pooling options
+ *
+ * Applied through an undici `Agent` when the optional `undici` package is
+ * installed, in which case requests are sent with undici's own `fetch`;
+ * otherwise the runtime's default `fetch` pooling is used.
+ */
+export interface ConnectionOptions {
+    /**
+     * How long idle sockets are kept open, in milliseconds (default: 30000)
+     */
+    keepAliveTimeout?: number;
+
+    /**
+     * Requests pipelined per connection (default: 1, no pipelining)
+     */
+    pipelining?: number;
+
+    /**
+     * Maximum number of connections per origin (default: 64)
+     */
+    connections?: number;
+
+    /**
+     * A pre-built `Dispatcher` to use instead of creating an `Agent`. It
+     * must come from the installed `undici` package, or, without undici,
+     * be compatible with the runtime's `fetch`
+     */
+    dispatcher?: unknown;
+}
+
 /**
  * SDK Configuration options
  */
@@ -22,6 +53,17 @@ export interface KyrazoConfig {
      */
     maxRetries?: number;
 
+    /**
+     * Longest `Retry-After` delay honoured before retrying, in milliseconds;
+     * longer delays fail the request instead (default: 30000)
+     */
+    maxRetryDelay?: number;
+
+    /**
+     * Keep-alive connection pooling options
+     */
+    connection?: ConnectionOptions;
+
     /**
      * Custom headers to include in all requests
      */
@@ -35,17 +77,30 @@ export const DEFAULT_CONFIG = {
     baseURL: "https://api.kyrazo.com",
     timeout: 30000,
     maxRetries: 3,
+    maxRetryDelay: 30000,
+    connection: {
+        keepAliveTimeout: 30000,
+        pipelining: 1,
+        connections: 64,
+    },
 } as const;
 
+/**
+ * Configuration with defaults applied
+ */
+export type ResolvedConfig = Required<Omit<KyrazoConfig, "headers">> & Pick<KyrazoConfig, "headers">;
+
 /**
  * Resolves user config with defaults
  */
-export function resolveConfig(config: KyrazoConfig): Required<Omit<KyrazoConfig, "headers">> & Pick<KyrazoConfig, "headers"> {
+export function resolveConfig(config: KyrazoConfig): ResolvedConfig {
     return {
         apiKey: config.apiKey,
         baseURL: config.baseURL ?? DEFAULT_CONFIG.baseURL,
         timeout: config.timeout ?? DEFAULT_CONFIG.timeout,
         maxRetries: config.maxRetries ?? DEFAULT_CONFIG.maxRetries,
+        maxRetryDelay: config.maxRetryDelay ?? DEFAULT_CONFIG.maxRetryDelay,
+        connection: { ...DEFAULT_CONFIG.connection, ...config.connection },
         headers: config.headers,
     };
 }
@@ -22,7 +22,11 @@
 export { Kyrazo } from "./client";
 
 // Configuration
-export { type KyrazoConfig, DEFAULT_CONFIG } from "./config";
+export {
+  type KyrazoConfig,
+  type ConnectionOptions,
+  DEFAULT_CONFIG,
+} from "./config";
 
 // Errors
 export {
@@ -93,5 +97,7 @@ export type {
   BatchPublishEventResponse,
 } from "./types/events";
 
+export type { PublishEventsStreamOptions } from "./modules/events/types";
+
 // Version
 export { VERSION } from "./version";
@@ -17,12 +17,16 @@
  *
  * // Publish multiple events in batch
  * await kyrazo.events.batch(projectId, [payload1, payload2]);
+ *
+ * // Publish a large or unbounded sequence of events
+ * for await (const result of kyrazo.events.stream(projectId, events)) {}
  * ```
  */
 
 import type { HttpClient } from "../../utils/http";
 import { createPublishEvent } from "./publish-event";
 import { createPublishEvents } from "./publish-events";
+import { createPublishEventsStream } from "./publish-events-stream";
 
 // Re-export types
 export type {
@@ -32,6 +36,7 @@ export type {
   PublishEventResponse,
   BatchPublishEventResponseItem,
   BatchPublishEventResponse,
+  PublishEventsStreamOptions,
 } from "./types";
 
 export type { EventTarget, EventData } from "../../types/common";
@@ -55,6 +60,14 @@ export interface EventsModule {
    * @see {@link createPublishEvents} for full documentation
    */
   batch: ReturnType<typeof createPublishEvents>;
+
+  /**
+   * Publish any number of events from an (async) iterable as concurrent
+   * batch requests
+   *
+   * @see {@link createPublishEventsStream} for full documentation
+   */
+  stream: ReturnType<typeof createPublishEventsStream>;
 }
 
 /**
@@ -68,5 +81,6 @@ export function createEventsModule(httpClient: HttpClient): EventsModule {
   return {
     single: createPublishEvent(httpClient),
     batch: createPublishEvents(httpClient),
+    stream: createPublishEventsStream(httpClient),
   };
 }
@@ -0,0 +1,105 @@
+/**
+ * Streaming Batch Publish Function
+ *
+ * Publishes an unbounded sequence of events as concurrent batch requests.
+ *
+ * @module modules/dispatch/publish-events-stream
+ */
+
+import type { HttpClient } from "../../utils/http";
+import { ValidationError } from "../../errors";
+import { createPublishEvents, MAX_BATCH_SIZE } from "./publish-events";
+import type {
+  PublishEventPayload,
+  BatchPublishEventResponse,
+  PublishEventsStreamOptions,
+} from "./types";
+
+/**
+ * Create the publishEventsStream function bound to an HTTP client
+ * @internal
+ */
+export function createPublishEventsStream(httpClient: HttpClient) {
+  const publishEvents = createPublishEvents(httpClient);
+
+  /**
+   * Publish events from an iterable or async iterable in batches
+   *
+   * Events are grouped into batches of `batchSize` (max 100) and sent with
+   * up to `concurrency` batch requests in flight. The source is only read
+   * while fewer requests are in flight, so memory stays bounded however
+   * many events it yields. Batch responses are yielded in source order.
+   *
+   * @param projectId - The project ID to publish events to
+   * @param events - Events to publish, e.g. an async generator or a stream
+   * @param options - Batch size, concurrency and idempotency key
+   * @returns Async iterator of batch responses
+   *
+   * @throws {ValidationError} When a batch contains invalid payloads
+   * @throws {KyrazoError} When a batch request fails; no further events are read
+   *
+   * @example Publishing from a database cursor
+   * ```typescript
+   * for await (const result of kyrazo.events.stream("project-123", cursor, {
+   *   concurrency: 8,
+   * })) {
+   *   console.log(`Queued ${result.queuedCount} of ${result.batchSize}`);
+   * }
+   * ```
+   */
+  return async function* publishEventsStream(
+    projectId: string,
+    events: AsyncIterable<PublishEventPayload> | Iterable<PublishEventPayload>,
+    options?: PublishEventsStreamOptions,
+  ): AsyncGenerator<BatchPublishEventResponse, void, undefined> {
+    const batchSize = options?.batchSize ?? MAX_BATCH_SIZE;
+    const concurrency = options?.concurrency ?? 4;
+
+    if (
+      !Number.isInteger(batchSize) ||
+      batchSize < 1 ||
+      batchSize > MAX_BATCH_SIZE
+    ) {
+      throw new ValidationError(
+        `batchSize must be an integer between 1 and ${MAX_BATCH_SIZE}`,
+      );
+    }
+    if (!Number.isInteger(concurrency) || concurrency < 1) {
+      throw new ValidationError("concurrency must be a positive integer");
+    }
+
+    const inFlight: Promise<BatchPublishEventResponse>[] = [];
+    let batchIndex = 0;
+
+    const send = (batch: PublishEventPayload[]) => {
+      // Each batch gets its own key, stable across retries of the stream
+      const batchOptions = options?.idempotencyKey
+        ? { idempotencyKey: `${options.idempotencyKey}-${batchIndex}` }
+        : undefined;
+      batchIndex++;
+      const request = publishEvents(projectId, batch, batchOptions);
+      // Failures surface when the batch is awaited in order
+      request.catch(() => undefined);
+      inFlight.push(request);
+    };
+
+    let batch: PublishEventPayload[] = [];
+    for await (const event of events) {
+      options?.signal?.throwIfAborted();
+      batch.push(event);
+      if (batch.length < batchSize) continue;
+
+      send(batch);
+      batch = [];
+      if (inFlight.length >= concurrency) {
+        yield await inFlight.shift()!;
+      }
+    }
+    if (batch.length > 0) {
+      send(batch);
+    }
+    while (inFlight.length > 0) {
+      yield await inFlight.shift()!;
+    }
+  };
+}
@@ -15,7 +15,7 @@ import type {
 } from "./types";
 
 /** Maximum events per batch request */
-const MAX_BATCH_SIZE = 100;
+export const MAX_BATCH_SIZE = 100;
 
 /**
  * Create the publishEvents function bound to an HTTP client
@@ -26,7 +26,8 @@ export function createPublishEvents(httpClient: HttpClient) {
    * Publish multiple events in a single batch request
    *
    * Sends up to 100 events in a single API call for efficient bulk operations.
-   * Each event is queued independently for delivery.
+   * Each event is queued independently for delivery. Use `stream` to publish
+   * more events than fit in one batch.
    *
    * @param projectId - The project ID to publish events to (MongoDB ObjectId format)
    * @param events - Array of event payloads (max 100 per batch)
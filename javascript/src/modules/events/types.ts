@@ -22,3 +22,28 @@ export interface PublishEventOptions {
    */
   idempotencyKey?: string;
 }
+
+/**
+ * Options for streaming events in batches
+ */
+export interface PublishEventsStreamOptions {
+  /**
+   * Events per batch request (default and max: 100)
+   */
+  batchSize?: number;
+
+  /**
+   * Maximum number of batch requests in flight (default: 4)
+   */
+  concurrency?: number;
+
+  /**
+   * Base idempotency key; batch `n` is sent with `<key>-<n>`
+   */
+  idempotencyKey?: string;
+
+  /**
+   * Stops reading events when aborted
+   */
+  signal?: AbortSignal;
+}
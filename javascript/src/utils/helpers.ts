@@ -9,6 +9,19 @@ export function sleep(ms: number): Promise<void> {
     return new Promise((resolve) => setTimeout(resolve, ms));
 }
 
+/**
+ * Parse a `Retry-After` header (delay in seconds or HTTP date) into
+ * milliseconds
+ */
+export function parseRetryAfter(value: string | null): number | undefined {
+    if (!value) return undefined;
+    if (/^\d+$/.test(value.trim())) {
+        return parseInt(value, 10) * 1000;
+    }
+    const date = Date.parse(value);
+    return Number.isNaN(date) ? undefined : Math.max(0, date - Date.now());
+}
+
 /**
  * Generate a random idempotency key
  */
@@ -2,13 +2,15 @@
  * HTTP utilities
  */
 
-import type { KyrazoConfig } from "../config";
+import type { ConnectionOptions, ResolvedConfig } from "../config";
 import {
   createErrorFromResponse,
   NetworkError,
+  RateLimitError,
   type APIErrorResponse,
 } from "../errors";
 import { VERSION } from "../version";
+import { parseRetryAfter } from "./helpers";
 
 /**
  * HTTP method types
@@ -37,6 +39,70 @@ export interface HttpResponse<T> {
   headers: Headers;
 }
 
+/**
+ * The `fetch` implementation used for requests and the dispatcher it is
+ * given, if any
+ */
+interface Transport {
+  fetch: (url: string, init: RequestInit) => Promise<Response>;
+  dispatcher?: unknown;
+}
+
+/**
+ * The parts of the `undici` package used here
+ */
+interface Undici {
+  Agent: new (options: object) => unknown;
+  fetch: Transport["fetch"];
+}
+
+/**
+ * Load the optional `undici` package, if it is installed
+ */
+async function loadUndici(): Promise<Undici | undefined> {
+  try {
+    // Resolved at runtime so that undici stays an optional dependency
+    const specifier = "undici";
+    const undici = await import(specifier);
+    if (
+      typeof undici.Agent !== "function" ||
+      typeof undici.fetch !== "function"
+    ) {
+      return undefined;
+    }
+    return { Agent: undici.Agent, fetch: undici.fetch };
+  } catch {
+    return undefined;
+  }
+}
+
+/**
+ * Build the transport for a client's connection options
+ *
+ * An undici `Agent` is only compatible with the `fetch` of the same undici
+ * package; the runtime's built-in `fetch` bundles its own, possibly
+ * different, copy. So whenever undici is installed, requests are sent with
+ * its `fetch` and a keep-alive `Agent` (or the given dispatcher).
+ */
+async function createTransport(options: ConnectionOptions): Promise<Transport> {
+  const { dispatcher, ...agentOptions } = options;
+  const undici = await loadUndici();
+  if (!undici) {
+    // Looked up per request, so the runtime's fetch can be replaced later
+    return { fetch: (url, init) => globalThis.fetch(url, init), dispatcher };
+  }
+  return {
+    fetch: undici.fetch,
+    dispatcher:
+      dispatcher ??
+      new undici.Agent({
+        keepAliveTimeout: agentOptions.keepAliveTimeout,
+        pipelining: agentOptions.pipelining,
+        connections: agentOptions.connections,
+      }),
+  };
+}
+
 /**
  * HTTP Client for making API requests
  */
@@ -45,19 +111,31 @@ export class HttpClient {
   private readonly apiKey: string;
   private readonly defaultTimeout: number;
   private readonly maxRetries: number;
+  private readonly maxRetryDelay: number;
+  private readonly connection: ConnectionOptions;
   private readonly customHeaders: Record<string, string>;
+  private transport?: Promise<Transport>;
 
-  constructor(
-    config: Required<Omit<KyrazoConfig, "headers">> &
-      Pick<KyrazoConfig, "headers">,
-  ) {
+  constructor(config: ResolvedConfig) {
     this.baseURL = config.baseURL.replace(/\/$/, ""); // Remove trailing slash
     this.apiKey = config.apiKey;
     this.defaultTimeout = config.timeout;
     this.maxRetries = config.maxRetries;
+    this.maxRetryDelay = config.maxRetryDelay;
+    this.connection = config.connection;
     this.customHeaders = config.headers ?? {};
   }
 
+  /**
+   * Get the shared transport that pools keep-alive connections
+   */
+  private getTransport(): Promise<Transport> {
+    if (!this.transport) {
+      this.transport = createTransport(this.connection);
+    }
+    return this.transport;
+  }
+
   /**
    * Build full URL with query parameters
    */
@@ -98,10 +176,14 @@ export class HttpClient {
     const url = this.buildUrl(config.path, config.params);
     const headers = this.buildHeaders(config.headers);
     const timeout = config.timeout ?? this.defaultTimeout;
+    // Serialized once; every attempt sends the same body
+    const body = config.body ? JSON.stringify(config.body) : undefined;
+    const transport = await this.getTransport();
 
     let lastError: Error | null = null;
 
     for (let attempt = 0; attempt <= this.maxRetries; attempt++) {
+      let retryAfter: number | undefined;
       try {
         const controller = new AbortController();
         const timeoutId = setTimeout(() => controller.abort(), timeout);
@@ -111,12 +193,17 @@ export class HttpClient {
           ? this.mergeAbortSignals(config.signal, controller.signal)
           : controller.signal;
 
-        const response = await fetch(url, {
+        // `dispatcher` is an undici extension to `RequestInit`
+        const init: RequestInit & { dispatcher?: unknown } = {
           method: config.method,
           headers,
-          body: config.body ? JSON.stringify(config.body) : undefined,
+          body,
           signal,
-        });
+        };
+        if (transport.dispatcher !== undefined) {
+          init.dispatcher = transport.dispatcher;
+        }
+        const response = await transport.fetch(url, init);
 
         clearTimeout(timeoutId);
 
@@ -132,6 +219,7 @@ export class HttpClient {
 
         // Handle error responses
         if (!response.ok) {
+          retryAfter = parseRetryAfter(response.headers.get("retry-after"));
           const errorBody = data as unknown as APIErrorResponse | null;
           const requestId = response.headers.get("x-request-id") ?? undefined;
           throw createErrorFromResponse(
@@ -149,20 +237,32 @@ export class HttpClient {
         };
       } catch (error) {
         lastError = error as Error;
+        const statusCode = (error as { statusCode?: number }).statusCode;
 
-        // Don't retry on client errors (4xx) or abort
+        // Don't retry on abort or on client errors (4xx) other than 429
         if (
           error instanceof Error &&
           (error.name === "AbortError" ||
-            ((error as { statusCode?: number }).statusCode !== undefined &&
-              (error as { statusCode?: number }).statusCode! < 500))
+            (statusCode !== undefined &&
+              statusCode < 500 &&
+              statusCode !== 429))
         ) {
           throw error;
         }
 
-        // Add exponential backoff for retries
         if (attempt < this.maxRetries) {
-          await this.delay(Math.pow(2, attempt) * 100);
+          if (
+            retryAfter === undefined &&
+            error instanceof RateLimitError &&
+            error.retryAfter !== undefined
+          ) {
+            retryAfter = error.retryAfter * 1000;
+          }
+          // Waiting longer than allowed is left to the caller
+          if (retryAfter !== undefined && retryAfter > this.maxRetryDelay) {
+            throw error;
+          }
+          await this.delay(retryAfter ?? this.backoff(attempt));
         }
       }
     }
@@ -193,6 +293,15 @@ export class HttpClient {
     return controller.signal;
   }
 
+  /**
+   * Exponential backoff with jitter, so that clients failing together do
+   * not retry together
+   */
+  private backoff(attempt: number): number {
+    const base = Math.pow(2, attempt) * 100;
+    return base / 2 + (Math.random() * base) / 2;
+  }
+
   /**
    * Delay helper for retry backoff
    */
@@ -0,0 +1,61 @@
+import { describe, it, expect, vi, beforeAll, afterAll } from "vitest";
+import { createServer, type Server } from "node:http";
+import type { AddressInfo } from "node:net";
+import { Agent } from "undici";
+import { HttpClient } from "../src/utils/http";
+import { resolveConfig } from "../src/config";
+
+describe("HttpClient with undici", () => {
+  let server: Server;
+  let baseURL: string;
+  let connections = 0;
+
+  beforeAll(async () => {
+    server = createServer((_request, response) => {
+      response.setHeader("content-type", "application/json");
+      response.end(JSON.stringify({ ok: true }));
+    });
+    server.on("connection", () => connections++);
+    await new Promise<void>((resolve) =>
+      server.listen(0, "127.0.0.1", resolve),
+    );
+    baseURL = `http://127.0.0.1:${(server.address() as AddressInfo).port}`;
+  });
+
+  afterAll(async () => {
+    server.closeAllConnections();
+    await new Promise((resolve) => server.close(resolve));
+  });
+
+  it("should reuse a keep-alive connection through its agent", async () => {
+    const client = new HttpClient(
+      resolveConfig({ apiKey: "test-key", baseURL }),
+    );
+    connections = 0;
+
+    const first = await client.get("/v1/test");
+    const second = await client.get("/v1/test");
+
+    expect(first.data).toEqual({ ok: true });
+    expect(second.data).toEqual({ ok: true });
+    expect(connections).toBe(1);
+  });
+
+  it("should send requests through a custom dispatcher", async () => {
+    const dispatcher = new Agent({ keepAliveTimeout: 1000 });
+    const dispatch = vi.spyOn(dispatcher, "dispatch");
+    const client = new HttpClient(
+      resolveConfig({
+        apiKey: "test-key",
+        baseURL,
+        connection: { dispatcher },
+      }),
+    );
+
+    const response = await client.get("/v1/test");
+
+    expect(response.data).toEqual({ ok: true });
+    expect(dispatch).toHaveBeenCalledTimes(1);
+    await dispatcher.close();
+  });
+});
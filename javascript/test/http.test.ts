@@ -0,0 +1,71 @@
+import { describe, it, expect, vi, afterEach } from "vitest";
+import { HttpClient } from "../src/utils/http";
+import { resolveConfig } from "../src/config";
+import { RateLimitError } from "../src/errors";
+
+// Without undici the client uses the global fetch, which these tests stub
+vi.mock("undici", () => ({}));
+
+function jsonResponse(
+  status: number,
+  body: unknown,
+  headers: Record<string, string> = {},
+) {
+  return new Response(JSON.stringify(body), {
+    status,
+    headers: { "content-type": "application/json", ...headers },
+  });
+}
+
+describe("HttpClient", () => {
+  const client = new HttpClient(
+    resolveConfig({
+      apiKey: "test-key",
+      baseURL: "http://localhost:4000",
+      maxRetryDelay: 1000,
+    }),
+  );
+
+  afterEach(() => {
+    vi.unstubAllGlobals();
+  });
+
+  it("should serialize the body once and reuse it across retries", async () => {
+    const fetchMock = vi
+      .fn()
+      .mockResolvedValueOnce(jsonResponse(503, {}, { "Retry-After": "0" }))
+      .mockResolvedValueOnce(jsonResponse(200, { ok: true }));
+    vi.stubGlobal("fetch", fetchMock);
+
+    const response = await client.post("/v1/test", { id: 1 });
+
+    expect(response.data).toEqual({ ok: true });
+    expect(fetchMock).toHaveBeenCalledTimes(2);
+    expect(fetchMock.mock.calls[0][1].body).toBe('{"id":1}');
+    expect(fetchMock.mock.calls[1][1].body).toBe(
+      fetchMock.mock.calls[0][1].body,
+    );
+  });
+
+  it("should retry rate limited requests after Retry-After", async () => {
+    const fetchMock = vi
+      .fn()
+      .mockResolvedValueOnce(jsonResponse(429, {}, { "Retry-After": "0" }))
+      .mockResolvedValueOnce(jsonResponse(200, { ok: true }));
+    vi.stubGlobal("fetch", fetchMock);
+
+    await client.get("/v1/test");
+
+    expect(fetchMock).toHaveBeenCalledTimes(2);
+  });
+
+  it("should not wait longer than maxRetryDelay", async () => {
+    const fetchMock = vi
+      .fn()
+      .mockResolvedValue(jsonResponse(429, {}, { "Retry-After": "60" }));
+    vi.stubGlobal("fetch", fetchMock);
+
+    await expect(client.get("/v1/test")).rejects.toThrow(RateLimitError);
+    expect(fetchMock).toHaveBeenCalledTimes(1);
+  });
+});
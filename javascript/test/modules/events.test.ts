@@ -127,4 +127,63 @@ describe("EventsModule", () => {
       );
     });
   });
+
+  describe("stream()", () => {
+    const makeEvent = (i: number) => ({
+      webhookId: "wh_1",
+      eventType: "e1",
+      payload: { id: i },
+      targets: [{ targetUrl: "https://u1.com" }],
+    });
+
+    async function* generate(count: number) {
+      for (let i = 0; i < count; i++) {
+        yield makeEvent(i);
+      }
+    }
+
+    it("should split events into batches with bounded concurrency", async () => {
+      let inFlight = 0;
+      let maxInFlight = 0;
+      mockHttpClient.post.mockImplementation(
+        async (_path: string, batch: unknown[]) => {
+          inFlight++;
+          maxInFlight = Math.max(maxInFlight, inFlight);
+          await new Promise((resolve) => setTimeout(resolve, 5));
+          inFlight--;
+          return { data: { batchSize: batch.length } };
+        },
+      );
+
+      const results = [];
+      for await (const result of events.stream("proj_123", generate(250), {
+        concurrency: 2,
+        idempotencyKey: "key",
+      })) {
+        results.push(result);
+      }
+
+      expect(results.map((r) => r.batchSize)).toEqual([100, 100, 50]);
+      expect(maxInFlight).toBe(2);
+      expect(mockHttpClient.post.mock.calls[2][2]).toEqual({
+        headers: { "Idempotency-Key": "key-2" },
+      });
+    });
+
+    it("should stop at the first failed batch", async () => {
+      mockHttpClient.post
+        .mockResolvedValueOnce({ data: { batchSize: 10 } })
+        .mockRejectedValueOnce(new ServerError("boom"));
+
+      const stream = events.stream("proj_123", generate(20), {
+        batchSize: 10,
+      });
+
+      await expect(async () => {
+        for await (const _ of stream) {
+          // drain
+        }
+      }).rejects.toThrow(ServerError);
+    });
+  });
 });
@@ -0,0 +1,103 @@
+"""
+Load benchmark for `kyrazo.receiver.WebhookReceiver`.
+
+Drives the ASGI app in-process through an httpx client, so the numbers
+reflect the receiver itself (authentication, parsing, deduplication and
+queueing) rather than an HTTP server. Run from the `python` directory,
+after `poetry install`:
+
+    poetry run python benchmarks/receiver_load.py --requests 20000 --concurrency 64
+
+or without installing the package:
+
+    PYTHONPATH=. python benchmarks/receiver_load.py --requests 20000 --concurrency 64
+"""
+
+import argparse
+import asyncio
+import json
+import time
+
+import httpx
+
+from kyrazo.receiver import WebhookReceiver
+from kyrazo.replay import percentile
+from kyrazo.resources.sources.models import SourceAuthentication
+
+
+async def run(args) -> None:
+    auth = SourceAuthentication(
+        enabled=True,
+        type="api_key",
+        apiKey={"headerKey": "X-Source-Key", "apiKey": "bench"},
+    )
+    receiver = WebhookReceiver(
+        authentication=auth, workers=args.workers, queue_size=args.queue_size
+    )
+
+    @receiver.on("*")
+    async def handle(event):
+        if args.handler_latency:
+            await asyncio.sleep(args.handler_latency)
+
+    payload = {"items": [{"sku": f"sku_{i}", "qty": i} for i in range(args.items)]}
+    bodies = [
+        json.dumps({"id": f"evt_{i}", "eventType": "order.created", "payload": payload})
+        for i in range(args.requests)
+    ]
+    # Every tenth delivery is a redelivery of the previous event
+    for i in range(10, args.requests, 10):
+        bodies[i] = bodies[i - 1]
+
+    latencies, statuses = [], {}
+    queue = iter(bodies)
+    transport = httpx.ASGITransport(app=receiver)
+    async with httpx.AsyncClient(
+        transport=transport,
+        base_url="http://receiver",
+        headers={"X-Source-Key": "bench", "Content-Type": "application/json"},
+    ) as client:
+
+        async def sender():
+            for body in queue:
+                started = time.perf_counter()
+                response = await client.post("/", content=body)
+                latencies.append(time.perf_counter() - started)
+                statuses[response.status_code] = (
+                    statuses.get(response.status_code, 0) + 1
+                )
+                # In-process calls never block on I/O; yield like a server would
+                await asyncio.sleep(0)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(sender() for _ in range(args.concurrency)))
+        acked = time.perf_counter() - started
+        await receiver.drain()
+        handled = time.perf_counter() - started
+    await receiver.close()
+
+    ordered = sorted(latencies)
+    print(f"requests      {args.requests} (concurrency {args.concurrency})")
+    print(f"statuses      {dict(sorted(statuses.items()))}")
+    print(f"ack rate      {args.requests / acked:,.0f} req/s")
+    print(f"ack p50       {percentile(ordered, 0.50) * 1000:.3f} ms")
+    print(f"ack p99       {percentile(ordered, 0.99) * 1000:.3f} ms")
+    print(f"all handled   {handled:.2f} s")
+    print(f"metrics       {receiver.metrics()}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--requests", type=int, default=10000)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--queue-size", type=int, default=1000)
+    parser.add_argument("--items", type=int, default=20, help="Items per payload")
+    parser.add_argument(
+        "--handler-latency", type=float, default=0.0, help="Seconds per handler"
+    )
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,9 @@
 from .client import Kyrazo
+from .provider import ClientProvider
+from .pool import KyrazoPool
+from .core.deadline import Deadline
+from .core.hedging import HedgePolicy
+from .core.recorder import TrafficRecorder
 from .core.exceptions import (
     KyrazoError,
     AuthenticationError,
@@ -7,10 +12,17 @@ from .core.exceptions import (
     RateLimitError,
     ServerError,
     NetworkError,
+    DeadlineExceededError,
+    RequestCancelledError,
 )
 
 __all__ = [
     "Kyrazo",
+    "ClientProvider",
+    "KyrazoPool",
+    "Deadline",
+    "HedgePolicy",
+    "TrafficRecorder",
     "KyrazoError",
     "AuthenticationError",
     "ValidationError",
@@ -18,4 +30,6 @@ __all__ = [
     "RateLimitError",
     "ServerError",
     "NetworkError",
+    "DeadlineExceededError",
+    "RequestCancelledError",
 ]
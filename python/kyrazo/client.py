@@ -1,5 +1,9 @@
-from typing import Optional
+import threading
+from typing import Any, Dict, List, Optional, Sequence, Union
 from .core.http_client import HttpClient
+from .core.hedging import HedgePolicy
+from .core.recorder import TrafficRecorder
+from .core.exceptions import KyrazoError
 from .resources.events.client import EventsClient
 from .resources.sources.client import SourcesClient
 from .resources.endpoints.client import EndpointsClient
@@ -9,16 +13,62 @@ from .resources.targets.client import TargetsClient
 class Kyrazo:
     """
     Main Kyrazo SDK Client.
+
+    A single instance can be shared across threads, and remains usable in
+    child processes after a fork; see `HttpClient` for details.
+
+    With `warm_on_init`, connections are opened in the background as soon
+    as the client is created, so the first requests after a deploy do not
+    pay for connection setup; see `warmup`.
+
+    `base_url` may be a list of base URLs to route and fail over between;
+    `routing` holds `EndpointRouter` settings for them.
     """
 
     def __init__(
         self,
         api_key: str,
-        base_url: str = "https://api.kyrazo.com",
+        base_url: Union[str, Sequence[str]] = "https://api.kyrazo.com",
         timeout: int = 30,
         retries: int = 3,
+        hedge: Optional[HedgePolicy] = None,
+        recorder: Optional[TrafficRecorder] = None,
+        warm_on_init: bool = False,
+        warm_connections: int = 4,
+        dns_cache_ttl: Optional[float] = 60.0,
+        keepalive_interval: Optional[float] = None,
+        routing: Optional[Dict[str, float]] = None,
     ):
-        self._http_client = HttpClient(api_key, base_url, timeout, retries)
+        self._init_modules(
+            HttpClient(
+                api_key,
+                base_url,
+                timeout,
+                retries,
+                hedge=hedge,
+                recorder=recorder,
+                dns_cache_ttl=dns_cache_ttl,
+                keepalive_interval=keepalive_interval,
+                routing=routing,
+            )
+        )
+        if warm_on_init:
+            threading.Thread(
+                target=self._warmup_quietly,
+                args=(warm_connections,),
+                name="kyrazo-warmup",
+                daemon=True,
+            ).start()
+
+    @classmethod
+    def _from_http_client(cls, http_client: HttpClient) -> "Kyrazo":
+        """Build a client around an existing `HttpClient`."""
+        client = cls.__new__(cls)
+        client._init_modules(http_client)
+        return client
+
+    def _init_modules(self, http_client: HttpClient):
+        self._http_client = http_client
 
         # Initialize modules
         self.events = EventsClient(self._http_client)
@@ -26,6 +76,36 @@ class Kyrazo:
         self.endpoints = EndpointsClient(self._http_client)
         self.targets = TargetsClient(self._http_client)
 
+    @property
+    def stats(self) -> Dict[str, int]:
+        """Counters for requests sent by this client, including hedges."""
+        return self._http_client.stats.snapshot()
+
+    @property
+    def timings(self) -> Dict[str, Dict[str, float]]:
+        """DNS, TCP connect and TLS handshake timings of new connections."""
+        return self._http_client.timings()
+
+    @property
+    def endpoint_health(self) -> List[Dict[str, Any]]:
+        """Health and latency of each base URL, when there are several."""
+        return self._http_client.endpoint_health()
+
+    def warmup(self, connections: int = 4) -> int:
+        """
+        Pre-establish up to `connections` pooled connections.
+
+        Returns the number of connections that were opened.
+        """
+        return self._http_client.warmup(connections)
+
+    def _warmup_quietly(self, connections: int):
+        # A failed warm-up must not break startup; requests will connect anyway
+        try:
+            self.warmup(connections)
+        except KyrazoError:
+            pass
+
     def close(self):
         """Close the underlying HTTP client."""
         self._http_client.close()
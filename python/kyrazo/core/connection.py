@@ -0,0 +1,227 @@
+import socket
+import ssl
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import httpcore
+import httpx
+
+from .stats import ClientStats
+
+
+class DNSCache:
+    """
+    Thread-safe cache of resolved host addresses.
+
+    Entries expire after `ttl` seconds and are dropped early when every
+    cached address of a host fails to connect, so a moved endpoint is
+    picked up on the next attempt.
+    """
+
+    def __init__(self, ttl: float = 60.0):
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._entries: Dict[Tuple[str, int], Tuple[float, List[str]]] = {}
+
+    def resolve(
+        self, host: str, port: int, stats: Optional[ClientStats] = None
+    ) -> List[str]:
+        """Return the addresses of `host`, resolving it when not cached."""
+        key = (host, port)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is not None and entry[0] > now:
+            if stats is not None:
+                stats.increment("dns_cache_hits")
+            return entry[1]
+
+        started = time.monotonic()
+        try:
+            infos = socket.getaddrinfo(host, port, type=socket.SOCK_STREAM)
+        except socket.gaierror as e:
+            raise httpcore.ConnectError(str(e)) from e
+        addresses = list(dict.fromkeys(info[4][0] for info in infos))
+        if stats is not None:
+            stats.increment("dns_lookups")
+            stats.observe("dns", time.monotonic() - started)
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, addresses)
+        return addresses
+
+    def invalidate(self, host: str, port: int):
+        with self._lock:
+            self._entries.pop((host, port), None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+class _ResumingContext:
+    """Wraps an `SSLContext` so that new sockets resume a saved session."""
+
+    def __init__(self, context: ssl.SSLContext, session: ssl.SSLSession):
+        self._context = context
+        self._session = session
+
+    def wrap_socket(self, sock, server_hostname=None, **kwargs):
+        return self._context.wrap_socket(
+            sock, server_hostname=server_hostname, session=self._session, **kwargs
+        )
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._context, name)
+
+
+class _TimedStream(httpcore.NetworkStream):
+    """A network stream that times its TLS handshake and saves its session."""
+
+    def __init__(
+        self,
+        stream: httpcore.NetworkStream,
+        backend: "ConnectionBackend",
+        server_hostname: Optional[str] = None,
+        ssl_context: Optional[ssl.SSLContext] = None,
+    ):
+        self._stream = stream
+        self._backend = backend
+        self._server_hostname = server_hostname
+        self._ssl_context = ssl_context
+
+    def read(self, max_bytes: int, timeout: Optional[float] = None) -> bytes:
+        return self._stream.read(max_bytes, timeout)
+
+    def write(self, buffer: bytes, timeout: Optional[float] = None) -> None:
+        self._stream.write(buffer, timeout)
+
+    def close(self) -> None:
+        # With TLS 1.3 the session ticket arrives after the handshake, so
+        # the session is saved when the connection is done with
+        self._backend._save_session(self)
+        self._stream.close()
+
+    def start_tls(
+        self,
+        ssl_context: ssl.SSLContext,
+        server_hostname: Optional[str] = None,
+        timeout: Optional[float] = None,
+    ) -> httpcore.NetworkStream:
+        backend = self._backend
+        session = backend._saved_session(ssl_context, server_hostname)
+        context = (
+            ssl_context if session is None else _ResumingContext(ssl_context, session)
+        )
+
+        started = time.monotonic()
+        stream = self._stream.start_tls(context, server_hostname, timeout)
+        backend.stats.observe("tls", time.monotonic() - started)
+
+        ssl_object = stream.get_extra_info("ssl_object")
+        if ssl_object is not None and ssl_object.session_reused:
+            backend.stats.increment("tls_resumed")
+        tls_stream = _TimedStream(stream, backend, server_hostname, ssl_context)
+        backend._save_session(tls_stream)
+        return tls_stream
+
+    def get_extra_info(self, info: str) -> Any:
+        return self._stream.get_extra_info(info)
+
+
+class ConnectionBackend(httpcore.NetworkBackend):
+    """
+    Network backend for the client's connection pool.
+
+    Resolves hosts through an optional `DNSCache`, resumes TLS sessions
+    across reconnects to the same host, and records DNS, TCP connect and
+    TLS handshake timings in `stats`.
+    """
+
+    def __init__(
+        self,
+        stats: ClientStats,
+        dns_cache: Optional[DNSCache] = None,
+        tls_session_reuse: bool = True,
+    ):
+        self.stats = stats
+        self.dns_cache = dns_cache
+        self.tls_session_reuse = tls_session_reuse
+        self._backend = httpcore.SyncBackend()
+        self._lock = threading.Lock()
+        self._sessions: Dict[str, Tuple[ssl.SSLContext, ssl.SSLSession]] = {}
+
+    def connect_tcp(
+        self,
+        host: str,
+        port: int,
+        timeout: Optional[float] = None,
+        local_address: Optional[str] = None,
+        socket_options: Optional[Iterable[Any]] = None,
+    ) -> httpcore.NetworkStream:
+        if self.dns_cache is None:
+            addresses = [host]
+        else:
+            addresses = self.dns_cache.resolve(host, port, self.stats)
+
+        error: Optional[Exception] = None
+        for address in addresses:
+            started = time.monotonic()
+            try:
+                stream = self._backend.connect_tcp(
+                    address, port, timeout, local_address, socket_options
+                )
+            except (httpcore.ConnectError, httpcore.ConnectTimeout) as e:
+                error = e
+                continue
+            self.stats.increment("connections")
+            self.stats.observe("connect", time.monotonic() - started)
+            return _TimedStream(stream, self)
+
+        if self.dns_cache is not None:
+            self.dns_cache.invalidate(host, port)
+        raise error
+
+    def connect_unix_socket(
+        self,
+        path: str,
+        timeout: Optional[float] = None,
+        socket_options: Optional[Iterable[Any]] = None,
+    ) -> httpcore.NetworkStream:
+        return self._backend.connect_unix_socket(path, timeout, socket_options)
+
+    def sleep(self, seconds: float) -> None:
+        self._backend.sleep(seconds)
+
+    def _saved_session(
+        self, context: ssl.SSLContext, server_hostname: Optional[str]
+    ) -> Optional[ssl.SSLSession]:
+        if not self.tls_session_reuse or not server_hostname:
+            return None
+        with self._lock:
+            saved = self._sessions.get(server_hostname)
+        # Sessions can only be resumed with the context that created them
+        if saved is None or saved[0] is not context:
+            return None
+        return saved[1]
+
+    def _save_session(self, stream: _TimedStream):
+        if not self.tls_session_reuse or not stream._server_hostname:
+            return
+        ssl_object = stream.get_extra_info("ssl_object")
+        session = ssl_object.session if ssl_object is not None else None
+        if session is not None:
+            with self._lock:
+                self._sessions[stream._server_hostname] = (
+                    stream._ssl_context,
+                    session,
+                )
+
+
+class PooledTransport(httpx.HTTPTransport):
+    """`httpx.HTTPTransport` whose connection pool uses a custom backend."""
+
+    def __init__(self, network_backend: httpcore.NetworkBackend, **kwargs: Any):
+        super().__init__(**kwargs)
+        # httpx does not expose the backend of the pool it builds
+        self._pool._network_backend = network_backend
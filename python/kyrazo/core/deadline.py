@@ -0,0 +1,91 @@
+import threading
+import time
+from typing import Iterator, Optional
+
+import httpx
+
+from .exceptions import DeadlineExceededError, RequestCancelledError
+
+
+class Deadline:
+    """
+    A time budget shared by one or more requests.
+
+    Pass the same deadline to several calls (or to a paginated listing) and
+    their combined duration never exceeds the budget. Calling `cancel` from
+    any thread makes every call that has not yet been sent fail with
+    `RequestCancelledError`; an attempt already in flight is abandoned once
+    the budget runs out, and stops at its next read after a cancel.
+    """
+
+    def __init__(self, timeout: float, parent: Optional["Deadline"] = None):
+        self._expires_at = time.monotonic() + timeout
+        self._cancelled = threading.Event()
+        self._parent = parent
+        if parent is not None:
+            self._expires_at = min(self._expires_at, parent._expires_at)
+
+    def remaining(self) -> float:
+        """Seconds left before the deadline, never negative."""
+        return max(0.0, self._expires_at - time.monotonic())
+
+    @property
+    def expired(self) -> bool:
+        return self.remaining() <= 0
+
+    @property
+    def cancelled(self) -> bool:
+        if self._cancelled.is_set():
+            return True
+        return self._parent is not None and self._parent.cancelled
+
+    def cancel(self):
+        """Cancel every request using this deadline."""
+        self._cancelled.set()
+
+    def child(self, timeout: float) -> "Deadline":
+        """Return a deadline that expires after `timeout` or with this one."""
+        return Deadline(timeout, parent=self)
+
+    def check(self):
+        """Raise if the deadline was cancelled or has expired."""
+        if self.cancelled:
+            raise RequestCancelledError()
+        if self.expired:
+            raise DeadlineExceededError()
+
+    def to_timeout(self) -> httpx.Timeout:
+        """An httpx timeout bounding every phase by the remaining budget."""
+        return httpx.Timeout(self.remaining())
+
+
+class DeadlineStream(httpx.SyncByteStream):
+    """
+    A response body stream that checks a deadline between reads.
+
+    httpx applies its read timeout to each socket read separately, so a
+    server trickling the body could otherwise outlast the budget.
+    """
+
+    def __init__(self, stream: httpx.SyncByteStream, deadline: Deadline):
+        self._stream = stream
+        self._deadline = deadline
+
+    def __iter__(self) -> Iterator[bytes]:
+        for chunk in self._stream:
+            self._deadline.check()
+            yield chunk
+
+    def close(self):
+        self._stream.close()
+
+
+def resolve_deadline(
+    timeout: Optional[float] = None, deadline: Optional[Deadline] = None
+) -> Optional[Deadline]:
+    """Combine a per-call timeout and deadline into the tighter of the two."""
+    if timeout is None:
+        return deadline
+    if deadline is None:
+        return Deadline(timeout)
+    return deadline.child(timeout)
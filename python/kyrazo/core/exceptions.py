@@ -51,3 +51,17 @@ class NetworkError(KyrazoError):
     """Raised when a network error occurs."""
 
     pass
+
+
+class DeadlineExceededError(NetworkError):
+    """Raised when a request does not complete within its time budget."""
+
+    def __init__(self, message: str = "Request deadline exceeded"):
+        super().__init__(message, code="DEADLINE_EXCEEDED")
+
+
+class RequestCancelledError(KyrazoError):
+    """Raised when a request is cancelled through its deadline."""
+
+    def __init__(self, message: str = "Request was cancelled"):
+        super().__init__(message, code="REQUEST_CANCELLED")
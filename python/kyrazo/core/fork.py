@@ -0,0 +1,24 @@
+import os
+import weakref
+from typing import Any
+
+# Objects to notify in a forked child, mapped to the method to call
+_handlers: "weakref.WeakKeyDictionary[Any, str]" = weakref.WeakKeyDictionary()
+
+
+def register_after_fork(obj: Any, method: str):
+    """
+    Call `obj.<method>()` in the child process after every fork.
+
+    Objects are held weakly, so registration does not keep them alive.
+    """
+    _handlers[obj] = method
+
+
+def _run_after_fork_handlers():
+    for obj, method in list(_handlers.items()):
+        getattr(obj, method)()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_run_after_fork_handlers)
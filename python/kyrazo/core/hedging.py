@@ -0,0 +1,91 @@
+import threading
+from collections import deque
+from typing import Deque, Optional
+
+
+class HedgePolicy:
+    """
+    Configuration and state for hedged requests.
+
+    When a hedgeable request (a GET, or a request carrying an
+    `Idempotency-Key`) has not completed after the `percentile` latency of
+    recent requests, a second copy is sent and the first response wins.
+
+    Args:
+        percentile: Latency percentile (0-1) after which a hedge is sent.
+        min_delay: Lower bound for the hedge delay, in seconds.
+        max_delay: Upper bound for the hedge delay, in seconds. Also used
+            until `min_samples` latencies have been observed.
+        max_hedge_ratio: Maximum fraction of requests that may be hedged.
+        burst: Maximum number of hedges that may be sent back to back.
+        window: Number of recent latencies the percentile is computed over.
+        min_samples: Latencies required before the percentile is trusted.
+        max_workers: Threads used to run concurrent attempts. Defaults to
+            two per pooled connection, so hedging never caps concurrency
+            below the connection pool.
+    """
+
+    def __init__(
+        self,
+        percentile: float = 0.95,
+        min_delay: float = 0.01,
+        max_delay: float = 1.0,
+        max_hedge_ratio: float = 0.05,
+        burst: int = 10,
+        window: int = 1000,
+        min_samples: int = 20,
+        max_workers: Optional[int] = None,
+    ):
+        if not 0 < percentile < 1:
+            raise ValueError("percentile must be between 0 and 1")
+        if not 0 <= max_hedge_ratio <= 1:
+            raise ValueError("max_hedge_ratio must be between 0 and 1")
+
+        self.percentile = percentile
+        self.min_delay = min_delay
+        self.max_delay = max_delay
+        self.max_hedge_ratio = max_hedge_ratio
+        self.burst = burst
+        self.min_samples = min_samples
+        self.max_workers = max_workers
+
+        self._lock = threading.Lock()
+        self._latencies: Deque[float] = deque(maxlen=window)
+        self._delay = max_delay
+        self._pending_samples = 0
+        self._tokens = float(burst)
+
+    def _reset_after_fork(self):
+        self._lock = threading.Lock()
+
+    def delay(self) -> float:
+        """Seconds to wait before sending a hedge."""
+        with self._lock:
+            return self._delay
+
+    def observe(self, latency: float):
+        """Record the latency of a completed attempt."""
+        with self._lock:
+            self._latencies.append(latency)
+            self._pending_samples += 1
+            # Recomputing the percentile on every sample is wasteful
+            if len(self._latencies) >= self.min_samples and (
+                self._pending_samples >= 16 or self._delay == self.max_delay
+            ):
+                ordered = sorted(self._latencies)
+                value = ordered[int(self.percentile * (len(ordered) - 1))]
+                self._delay = min(self.max_delay, max(self.min_delay, value))
+                self._pending_samples = 0
+
+    def on_request(self):
+        """Accrue hedge budget for one request."""
+        with self._lock:
+            self._tokens = min(float(self.burst), self._tokens + self.max_hedge_ratio)
+
+    def try_acquire(self) -> bool:
+        """Consume budget for one hedge, returning False if none is left."""
+        with self._lock:
+            if self._tokens < 1:
+                return False
+            self._tokens -= 1
+            return True
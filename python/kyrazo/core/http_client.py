@@ -1,5 +1,17 @@
+import threading
+import time
+import uuid
+import weakref
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Future,
+    ThreadPoolExecutor,
+    TimeoutError as FutureTimeoutError,
+    wait,
+)
+
 import httpx
-from typing import Optional, Any, Dict, Union
+from typing import Optional, Any, Dict, Iterator, List, Sequence, Union
 from .exceptions import (
     KyrazoError,
     AuthenticationError,
@@ -8,32 +20,186 @@ from .exceptions import (
     RateLimitError,
     ServerError,
     NetworkError,
+    DeadlineExceededError,
 )
+from .deadline import Deadline, DeadlineStream, resolve_deadline
+from .hedging import HedgePolicy
+from .stats import ClientStats
+from .fork import register_after_fork
+from .recorder import TrafficRecorder, body_size
+from .connection import ConnectionBackend, DNSCache, PooledTransport
+from .routing import EndpointRouter
+
+MAX_CONNECTIONS = 100
+
+
+def _keepalive_loop(ref: "weakref.ref[HttpClient]", stop: threading.Event):
+    # Holds the client weakly so an abandoned client can still be collected
+    while True:
+        client = ref()
+        if client is None:
+            return
+        interval = client.keepalive_interval
+        del client
+        if stop.wait(interval):
+            return
+        client = ref()
+        if client is None:
+            return
+        if time.monotonic() - client._last_used >= interval:
+            client._ping()
+        del client
 
 
 class HttpClient:
+    """
+    Low-level HTTP client shared by all resource clients.
+
+    Instances are thread-safe and meant to be shared: the underlying
+    connection pool is built lazily and guarded by a lock. They are also
+    fork-safe: after `os.fork()` (pre-fork servers, prefork workers) the child
+    discards the inherited pool and builds its own on first use, so a client
+    created before forking keeps working in every worker.
+
+    Host lookups are cached for `dns_cache_ttl` seconds (None disables the
+    cache) and TLS sessions are resumed when connections are re-established.
+    With `keepalive_interval`, a background thread pings the API whenever
+    the client has been idle that long, so pooled connections stay open.
+
+    `base_url` may list several base URLs (regional edges, a local relay).
+    Requests then go to the healthiest, fastest one and fail over to the
+    next on connection errors and 5xx responses; see `EndpointRouter`, which
+    `routing` configures. POSTs without an `Idempotency-Key` are given one,
+    and the same key is sent to every endpoint tried, so a request that
+    reached a failing endpoint is not duplicated by the failover. Only keys
+    supplied by the caller make a POST eligible for hedging.
+    """
+
     def __init__(
         self,
         api_key: str,
-        base_url: str = "https://api.kyrazo.com",
+        base_url: Union[str, Sequence[str]] = "https://api.kyrazo.com",
         timeout: int = 30,
         retries: int = 3,
+        hedge: Optional[HedgePolicy] = None,
+        recorder: Optional[TrafficRecorder] = None,
+        shared: Optional["HttpClient"] = None,
+        dns_cache_ttl: Optional[float] = 60.0,
+        keepalive_interval: Optional[float] = None,
+        routing: Optional[Dict[str, float]] = None,
     ):
-        self.base_url = base_url.rstrip("/")
+        # A client created with `shared` sends its requests, with its own
+        # credentials, through the shared client's pool and settings
+        if shared is not None:
+            base_url, timeout, retries = (
+                shared.base_urls,
+                shared.timeout,
+                shared.retries,
+            )
+            hedge, recorder = shared.hedge, shared.recorder
+            keepalive_interval = None
+        urls = [base_url] if isinstance(base_url, str) else list(base_url)
+        self.base_urls = [url.rstrip("/") for url in urls]
+        self.base_url = self.base_urls[0]
+        if shared is not None:
+            self.router = shared.router
+        elif len(self.base_urls) > 1:
+            self.router = EndpointRouter(self.base_urls, **(routing or {}))
+        else:
+            self.router = None
         self.api_key = api_key
         self.timeout = timeout
         self.retries = retries
-        self._client = httpx.Client(
+        self.hedge = hedge
+        self.recorder = recorder
+        self._shared = shared
+        self.stats = ClientStats()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._deadline_executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._client: Optional[httpx.Client] = None
+        self._closed = False
+        self.dns_cache = DNSCache(dns_cache_ttl) if dns_cache_ttl else None
+        self.keepalive_interval = keepalive_interval
+        self._warm_connections = 1
+        self._last_used = time.monotonic()
+        self._keepalive_stop = threading.Event()
+        self._start_keepalive()
+        register_after_fork(self, "_reset_after_fork")
+
+    def _build_client(self) -> httpx.Client:
+        return httpx.Client(
             base_url=self.base_url,
             headers={
-                "Authorization": f"Bearer {api_key}",
                 "Content-Type": "application/json",
                 "User-Agent": "kyrazo-python-sdk/1.0.0",
             },
-            timeout=timeout,
-            transport=httpx.HTTPTransport(retries=retries),
+            timeout=self.timeout,
+            transport=PooledTransport(
+                ConnectionBackend(self.stats, self.dns_cache),
+                retries=self.retries,
+                limits=self._limits(),
+            ),
         )
 
+    def _limits(self) -> httpx.Limits:
+        expiry = 5.0
+        if self.keepalive_interval:
+            # Idle connections must outlive the gap between two pings
+            expiry = max(expiry, self.keepalive_interval * 2)
+        return httpx.Limits(
+            max_connections=MAX_CONNECTIONS,
+            max_keepalive_connections=20,
+            keepalive_expiry=expiry,
+        )
+
+    def _start_keepalive(self):
+        if not self.keepalive_interval:
+            return
+        threading.Thread(
+            target=_keepalive_loop,
+            args=(weakref.ref(self), self._keepalive_stop),
+            name="kyrazo-keepalive",
+            daemon=True,
+        ).start()
+
+    def _get_client(self) -> httpx.Client:
+        """Return the pooled httpx client, building it on first use."""
+        if self._shared is not None:
+            if self._closed:
+                raise KyrazoError("Client has been closed", code="CLIENT_CLOSED")
+            return self._shared._get_client()
+        client = self._client
+        if client is None:
+            with self._lock:
+                if self._closed:
+                    raise KyrazoError("Client has been closed", code="CLIENT_CLOSED")
+                if self._client is None:
+                    self._client = self._build_client()
+                client = self._client
+        return client
+
+    def _reset_after_fork(self):
+        # The parent's pooled sockets must never be used from the child, so
+        # drop them without closing (closing could shut down the parent's
+        # connections) and rebuild lazily. Locks may have been held by
+        # threads that do not exist in the child.
+        self._lock = threading.Lock()
+        self._client = None
+        self._executor = None
+        self._deadline_executor = None
+        self.stats = ClientStats()
+        if self.hedge is not None:
+            self.hedge._reset_after_fork()
+        if self.dns_cache is not None:
+            self.dns_cache._lock = threading.Lock()
+        if self.router is not None:
+            self.router._reset_after_fork()
+        # Threads do not survive a fork
+        self._keepalive_stop = threading.Event()
+        if not self._closed:
+            self._start_keepalive()
+
     def _handle_response(self, response: httpx.Response) -> Any:
         try:
             response.raise_for_status()
@@ -86,40 +252,406 @@ class HttpClient:
         self,
         method: str,
         path: str,
-        data: Optional[Dict[str, Any]] = None,
+        data: Optional[Union[Dict[str, Any], List[Any]]] = None,
         params: Optional[Dict[str, Any]] = None,
         headers: Optional[Dict[str, str]] = None,
+        content: Optional[bytes] = None,
+        timeout: Optional[float] = None,
+        deadline: Optional[Deadline] = None,
     ) -> Any:
+        deadline = resolve_deadline(timeout, deadline)
+        if deadline is not None:
+            deadline.check()
+
+        # Credentials are applied per request so that clients can share a pool
+        headers = {"Authorization": f"Bearer {self.api_key}", **(headers or {})}
+        # Decided before a key is generated: the generated key makes failover
+        # safe, but the caller has not vouched that the request may be hedged
+        hedge = self._is_hedgeable(method, headers)
+        if (
+            self.router is not None
+            and method == "POST"
+            and not any(name.lower() == "idempotency-key" for name in headers)
+        ):
+            headers["Idempotency-Key"] = str(uuid.uuid4())
+        kwargs: Dict[str, Any] = {"params": params, "headers": headers}
+        # Pre-encoded JSON bodies are sent as-is, bypassing httpx's encoder
+        if content is not None:
+            kwargs["content"] = content
+        else:
+            kwargs["json"] = data
+        if deadline is not None:
+            kwargs["timeout"] = deadline.to_timeout()
+
+        response: Optional[httpx.Response] = None
+        started_at, started = time.time(), time.monotonic()
+        self._last_used = started
         try:
-            response = self._client.request(
-                method, path, json=data, params=params, headers=headers
-            )
+            self.stats.increment("requests")
+            if self.router is None:
+                response = self._send(method, path, kwargs, deadline, hedge)
+            else:
+                response = self._send_routed(method, path, kwargs, deadline, hedge)
             return self._handle_response(response)
+        except httpx.TimeoutException as e:
+            if deadline is not None:
+                raise DeadlineExceededError(f"Request deadline exceeded: {str(e)}")
+            raise NetworkError(f"Request failed: {str(e)}")
         except Exception as e:
             # Re-raise if it's already a KyrazoError, otherwise wrap it
             if isinstance(e, KyrazoError):
                 raise e
             raise NetworkError(f"Request failed: {str(e)}")
+        finally:
+            if self.recorder is not None:
+                self._record(method, path, kwargs, response, started_at, started)
+
+    def _record(
+        self,
+        method: str,
+        path: str,
+        kwargs: Dict[str, Any],
+        response: Optional[httpx.Response],
+        started_at: float,
+        started: float,
+    ):
+        if response is not None:
+            request = response.request
+            sent_headers = request.headers
+        else:
+            request = None
+            defaults = self._client.headers if self._client is not None else {}
+            sent_headers = {**defaults, **(kwargs["headers"] or {})}
+        self.recorder.record(
+            method,
+            path,
+            body_size(kwargs, request),
+            sent_headers,
+            response.status_code if response is not None else 0,
+            started_at,
+            time.monotonic() - started,
+        )
+
+    def _send(
+        self,
+        method: str,
+        url: str,
+        kwargs: Dict[str, Any],
+        deadline: Optional[Deadline],
+        hedge: bool = False,
+    ) -> httpx.Response:
+        if hedge:
+            return self._send_hedged(method, url, kwargs, deadline)
+        if deadline is not None:
+            return self._send_bounded(method, url, kwargs, deadline)
+        return self._get_client().request(method, url, **kwargs)
+
+    def _attempt(
+        self,
+        client: httpx.Client,
+        method: str,
+        url: str,
+        kwargs: Dict[str, Any],
+        deadline: Optional[Deadline],
+    ) -> httpx.Response:
+        """Send one attempt, reading its body under the deadline."""
+        if deadline is None:
+            return client.request(method, url, **kwargs)
+        request = client.build_request(method, url, **kwargs)
+        response = client.send(request, stream=True)
+        response.stream = DeadlineStream(response.stream, deadline)
+        try:
+            response.read()
+        except BaseException:
+            response.close()
+            raise
+        return response
+
+    def _send_bounded(
+        self,
+        method: str,
+        url: str,
+        kwargs: Dict[str, Any],
+        deadline: Deadline,
+    ) -> httpx.Response:
+        # httpx timeouts bound each phase, not the total: the transport
+        # retries connecting with the full timeout and headers are read one
+        # timed read at a time. The attempt runs on a worker so the caller
+        # gets control back when the budget runs out; the abandoned attempt
+        # stops at its next read.
+        future = self._get_deadline_executor().submit(
+            self._attempt, self._get_client(), method, url, kwargs, deadline
+        )
+        return self._result(future, deadline)
+
+    @staticmethod
+    def _result(future: Future, deadline: Optional[Deadline]) -> httpx.Response:
+        try:
+            return future.result(
+                timeout=deadline.remaining() if deadline is not None else None
+            )
+        except FutureTimeoutError:
+            raise DeadlineExceededError()
+
+    def _send_routed(
+        self,
+        method: str,
+        path: str,
+        kwargs: Dict[str, Any],
+        deadline: Optional[Deadline],
+        hedge: bool = False,
+    ) -> httpx.Response:
+        """Send to the best endpoint, failing over to the others in turn."""
+        endpoints = self.router.order()
+        response: Optional[httpx.Response] = None
+        error: Optional[Exception] = None
+        for index, endpoint in enumerate(endpoints):
+            if index:
+                self.stats.increment("failovers")
+                if deadline is not None:
+                    deadline.check()
+                    kwargs["timeout"] = deadline.to_timeout()
+            started = time.monotonic()
+            try:
+                response = self._send(method, endpoint + path, kwargs, deadline, hedge)
+            except httpx.TransportError as e:
+                self.router.record(endpoint, time.monotonic() - started, ok=False)
+                error = e
+                continue
+            # Only server errors say something about the endpoint's health
+            ok = response.status_code < 500
+            self.router.record(endpoint, time.monotonic() - started, ok=ok)
+            if ok:
+                return response
+        if response is not None:
+            return response
+        raise error
 
-    def get(self, path: str, params: Optional[Dict[str, Any]] = None) -> Any:
-        return self.request("GET", path, params=params)
+    def endpoint_health(self) -> List[Dict[str, Any]]:
+        """Health and latency of each base URL, when there are several."""
+        return self.router.snapshot() if self.router is not None else []
+
+    def _is_hedgeable(self, method: str, headers: Optional[Dict[str, str]]) -> bool:
+        # Only requests that are safe to duplicate may be hedged
+        if self.hedge is None:
+            return False
+        return method == "GET" or bool(headers and headers.get("Idempotency-Key"))
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._shared is not None:
+            return self._shared._get_executor()
+        with self._lock:
+            if self._executor is None:
+                # A primary attempt and its hedge per pooled connection;
+                # threads are only started when needed
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.hedge.max_workers or 2 * MAX_CONNECTIONS,
+                    thread_name_prefix="kyrazo-hedge",
+                )
+            return self._executor
+
+    def _get_deadline_executor(self) -> ThreadPoolExecutor:
+        if self._shared is not None:
+            return self._shared._get_deadline_executor()
+        with self._lock:
+            if self._deadline_executor is None:
+                # One worker per pooled connection; more could only queue
+                self._deadline_executor = ThreadPoolExecutor(
+                    max_workers=MAX_CONNECTIONS,
+                    thread_name_prefix="kyrazo-deadline",
+                )
+            return self._deadline_executor
+
+    def _send_hedged(
+        self,
+        method: str,
+        url: str,
+        kwargs: Dict[str, Any],
+        deadline: Optional[Deadline],
+    ) -> httpx.Response:
+        policy = self.hedge
+        executor = self._get_executor()
+        policy.on_request()
+
+        client = self._get_client()
+        started = time.monotonic()
+        primary = executor.submit(self._attempt, client, method, url, kwargs, deadline)
+
+        def observe(future: Future):
+            if future.exception() is None:
+                policy.observe(time.monotonic() - started)
+
+        primary.add_done_callback(observe)
+
+        delay = policy.delay()
+        if deadline is not None:
+            delay = min(delay, deadline.remaining())
+        done, _ = wait([primary], timeout=delay)
+        if done:
+            return primary.result()
+        if not policy.try_acquire():
+            self.stats.increment("hedges_suppressed")
+            return self._result(primary, deadline)
+
+        self.stats.increment("hedges")
+        hedge = executor.submit(self._attempt, client, method, url, kwargs, deadline)
+        pending = {primary, hedge}
+        error: Optional[BaseException] = None
+        while pending:
+            done, pending = wait(
+                pending,
+                timeout=deadline.remaining() if deadline is not None else None,
+                return_when=FIRST_COMPLETED,
+            )
+            if not done:
+                raise DeadlineExceededError()
+            for future in done:
+                if future.exception() is not None:
+                    error = future.exception()
+                    continue
+                if future is hedge:
+                    self.stats.increment("hedge_wins")
+                # The slower attempt finishes in the background and is dropped
+                return future.result()
+        raise error
+
+    def warmup(self, connections: int = 4) -> int:
+        """
+        Open up to `connections` pooled connections (per base URL) ahead of
+        the first requests, paying for DNS, TCP and TLS setup up front.
+
+        Returns the number of connections that were newly established.
+        Raises `NetworkError` if the API could not be reached at all.
+        """
+        connections = max(1, connections)
+        self._warm_connections = max(self._warm_connections, connections)
+        before = self._pool_stats().get("connections")
+        client = self._get_client()
+        # With several base URLs each one is warmed, ready for failover
+        urls = ["/"] if self.router is None else [f"{u}/" for u in self.base_urls]
+        # Concurrent requests cannot share a connection, so each one makes
+        # the pool open (or reuse) a connection of its own
+        with ThreadPoolExecutor(
+            max_workers=connections * len(urls), thread_name_prefix="kyrazo-warmup"
+        ) as executor:
+            futures = [
+                executor.submit(client.request, "HEAD", url)
+                for url in urls
+                for _ in range(connections)
+            ]
+        errors = [f.exception() for f in futures if f.exception() is not None]
+        if len(errors) == len(futures):
+            raise NetworkError(f"Warm-up failed: {str(errors[0])}")
+        return self._pool_stats().get("connections") - before
+
+    def _ping(self):
+        try:
+            self.warmup(self._warm_connections)
+        except KyrazoError:
+            pass
+
+    def _pool_stats(self) -> ClientStats:
+        # Connection-level counters live with the client that owns the pool
+        return self._shared.stats if self._shared is not None else self.stats
+
+    def timings(self) -> Dict[str, Dict[str, float]]:
+        """Connection-setup timings (dns, connect, tls) of the pool."""
+        return self._pool_stats().timings()
+
+    def paginate(
+        self,
+        path: str,
+        params: Optional[Dict[str, Any]] = None,
+        timeout: Optional[float] = None,
+        deadline: Optional[Deadline] = None,
+    ) -> Iterator[Any]:
+        """
+        Yield the items of every page of a paginated listing.
+
+        A `timeout` or `deadline` covers all pages, not each page.
+        """
+        deadline = resolve_deadline(timeout, deadline)
+        params = dict(params or {})
+        page = int(params.pop("page", 1))
+        while True:
+            response = self.get(
+                path, params={**params, "page": page}, deadline=deadline
+            )
+            items = response.get("data") or []
+            yield from items
+
+            pages = (response.get("pagination") or {}).get("pages", page)
+            if not items or page >= pages:
+                break
+            page += 1
+
+    def get(
+        self,
+        path: str,
+        params: Optional[Dict[str, Any]] = None,
+        timeout: Optional[float] = None,
+        deadline: Optional[Deadline] = None,
+    ) -> Any:
+        return self.request(
+            "GET", path, params=params, timeout=timeout, deadline=deadline
+        )
 
     def post(
         self,
         path: str,
-        data: Optional[Dict[str, Any]] = None,
+        data: Optional[Union[Dict[str, Any], List[Any]]] = None,
         headers: Optional[Dict[str, str]] = None,
+        content: Optional[bytes] = None,
+        timeout: Optional[float] = None,
+        deadline: Optional[Deadline] = None,
     ) -> Any:
-        return self.request("POST", path, data=data, headers=headers)
+        return self.request(
+            "POST",
+            path,
+            data=data,
+            headers=headers,
+            content=content,
+            timeout=timeout,
+            deadline=deadline,
+        )
 
-    def put(self, path: str, data: Optional[Dict[str, Any]] = None) -> Any:
-        return self.request("PUT", path, data=data)
+    def put(
+        self,
+        path: str,
+        data: Optional[Dict[str, Any]] = None,
+        timeout: Optional[float] = None,
+        deadline: Optional[Deadline] = None,
+    ) -> Any:
+        return self.request("PUT", path, data=data, timeout=timeout, deadline=deadline)
 
-    def patch(self, path: str, data: Optional[Dict[str, Any]] = None) -> Any:
-        return self.request("PATCH", path, data=data)
+    def patch(
+        self,
+        path: str,
+        data: Optional[Dict[str, Any]] = None,
+        timeout: Optional[float] = None,
+        deadline: Optional[Deadline] = None,
+    ) -> Any:
+        return self.request(
+            "PATCH", path, data=data, timeout=timeout, deadline=deadline
+        )
 
-    def delete(self, path: str) -> Any:
-        return self.request("DELETE", path)
+    def delete(
+        self,
+        path: str,
+        timeout: Optional[float] = None,
+        deadline: Optional[Deadline] = None,
+    ) -> Any:
+        return self.request("DELETE", path, timeout=timeout, deadline=deadline)
 
     def close(self):
-        self._client.close()
+        self._keepalive_stop.set()
+        with self._lock:
+            self._closed = True
+            for executor in (self._executor, self._deadline_executor):
+                if executor is not None:
+                    executor.shutdown(wait=False)
+            # Clients sharing a pool leave it to its owner
+            if self._client is not None and self._shared is None:
+                self._client.close()
+            # Later requests must not reach the closed pool via the fast path
+            self._client = None
@@ -0,0 +1,97 @@
+import json
+import logging
+import logging.handlers
+from typing import Any, Dict, Mapping, Optional
+
+# Path segments that are part of the route rather than resource IDs
+ROUTE_SEGMENTS = frozenset({"publish", "batch", "secret"})
+REDACTED_HEADERS = frozenset({"authorization", "x-api-key"})
+
+
+def path_template(path: str) -> str:
+    """
+    Replace the IDs in an API path with placeholders.
+
+    "/v1/targets/proj_1/tgt_2/secret" becomes
+    "/v1/targets/{project_id}/{id}/secret".
+    """
+    segments = path.split("?", 1)[0].strip("/").split("/")
+    for i in range(2, len(segments)):
+        if segments[i] in ROUTE_SEGMENTS:
+            continue
+        segments[i] = "{project_id}" if i == 2 else "{id}"
+    return "/" + "/".join(segments)
+
+
+def redact_headers(headers: Mapping[str, str]) -> Dict[str, str]:
+    """Lower-case header names and redact credentials."""
+    return {
+        name.lower(): "[REDACTED]" if name.lower() in REDACTED_HEADERS else value
+        for name, value in headers.items()
+    }
+
+
+class TrafficRecorder:
+    """
+    Records the shape of every request sent by an `HttpClient` to a rotating
+    JSON-lines file, for later replay with `kyrazo.replay`.
+
+    Each line holds the wall-clock start time (`t`), method (`m`), path
+    template (`p`), body size in bytes (`b`), headers with credentials
+    redacted (`h`), response status (`s`, 0 on network errors) and duration
+    in milliseconds (`d`). Payloads are never recorded.
+
+    Args:
+        path: File to write to.
+        max_bytes: Size at which the file is rotated.
+        backup_count: Number of rotated files to keep.
+    """
+
+    def __init__(self, path: str, max_bytes: int = 10_000_000, backup_count: int = 3):
+        self.path = path
+        # RotatingFileHandler provides size-based rotation and its own locking
+        self._handler = logging.handlers.RotatingFileHandler(
+            path, maxBytes=max_bytes, backupCount=backup_count, encoding="utf-8"
+        )
+        self._handler.setFormatter(logging.Formatter("%(message)s"))
+
+    def record(
+        self,
+        method: str,
+        path: str,
+        body_size: int,
+        headers: Mapping[str, str],
+        status: int,
+        started_at: float,
+        duration: float,
+    ):
+        """Append one request to the log."""
+        line = json.dumps(
+            {
+                "t": round(started_at, 6),
+                "m": method,
+                "p": path_template(path),
+                "b": body_size,
+                "h": redact_headers(headers),
+                "s": status,
+                "d": round(duration * 1000, 3),
+            },
+            separators=(",", ":"),
+        )
+        self._handler.handle(
+            logging.LogRecord("kyrazo.recorder", logging.INFO, "", 0, line, None, None)
+        )
+
+    def close(self):
+        self._handler.close()
+
+
+def body_size(kwargs: Dict[str, Any], request: Optional[Any] = None) -> int:
+    """Size of a request body, from the sent request when available."""
+    if request is not None:
+        return len(request.content)
+    if kwargs.get("content") is not None:
+        return len(kwargs["content"])
+    if kwargs.get("json") is not None:
+        return len(json.dumps(kwargs["json"], separators=(",", ":")))
+    return 0
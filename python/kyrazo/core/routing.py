@@ -0,0 +1,149 @@
+import threading
+import time
+from typing import Any, Dict, List, Optional, Sequence
+
+
+class _Endpoint:
+    __slots__ = (
+        "url",
+        "latency",
+        "error_rate",
+        "failures",
+        "demotions",
+        "demoted_until",
+        "probe_started",
+    )
+
+    def __init__(self, url: str):
+        self.url = url
+        # None until the first response, so every endpoint is tried once
+        self.latency: Optional[float] = None
+        self.error_rate = 0.0
+        self.failures = 0
+        self.demotions = 0
+        self.demoted_until = 0.0
+        # When the pending probe request was handed out, or 0
+        self.probe_started = 0.0
+
+
+class EndpointRouter:
+    """
+    Orders a client's base URLs by health and latency.
+
+    Each endpoint tracks an exponentially weighted moving average (EWMA) of
+    its latency and error rate; healthy endpoints are ranked by expected
+    latency, `latency / (1 - error_rate)`. An endpoint that fails
+    `max_failures` times in a row, or whose error rate reaches
+    `error_threshold`, is demoted for `cooldown` seconds, doubling on every
+    demotion up to `max_cooldown`. Once its cooldown has passed, one request
+    probes it first; a success restores it, a failure demotes it again.
+    Demoted endpoints are still tried last, when every other one failed.
+
+    Args:
+        urls: The base URLs, in order of preference for ties.
+        alpha: Weight of the newest sample in the moving averages.
+        error_threshold: Error rate at which an endpoint is demoted.
+        max_failures: Consecutive failures at which an endpoint is demoted.
+        cooldown: Seconds a newly demoted endpoint is avoided.
+        max_cooldown: Upper bound for the demotion period.
+    """
+
+    def __init__(
+        self,
+        urls: Sequence[str],
+        alpha: float = 0.2,
+        error_threshold: float = 0.5,
+        max_failures: int = 3,
+        cooldown: float = 5.0,
+        max_cooldown: float = 300.0,
+    ):
+        if not urls:
+            raise ValueError("At least one base URL is required")
+        if not 0 < alpha <= 1:
+            raise ValueError("alpha must be between 0 and 1")
+
+        self.alpha = alpha
+        self.error_threshold = error_threshold
+        self.max_failures = max_failures
+        self.cooldown = cooldown
+        self.max_cooldown = max_cooldown
+        self._lock = threading.Lock()
+        self._endpoints = [_Endpoint(url.rstrip("/")) for url in urls]
+
+    def _reset_after_fork(self):
+        self._lock = threading.Lock()
+        for endpoint in self._endpoints:
+            endpoint.probe_started = 0.0
+
+    def _score(self, endpoint: _Endpoint) -> float:
+        latency = endpoint.latency or 0.0
+        return latency / max(1.0 - endpoint.error_rate, 0.01)
+
+    def order(self) -> List[str]:
+        """Base URLs to try for the next request, best first."""
+        now = time.monotonic()
+        with self._lock:
+            healthy, probes, demoted = [], [], []
+            for endpoint in self._endpoints:
+                if endpoint.demoted_until > now:
+                    demoted.append(endpoint)
+                elif not endpoint.demotions:
+                    healthy.append(endpoint)
+                elif now - endpoint.probe_started < self.cooldown:
+                    # A probe is in flight (or was lost); wait for it
+                    demoted.append(endpoint)
+                else:
+                    endpoint.probe_started = now
+                    probes.append(endpoint)
+            healthy.sort(key=self._score)
+            return [endpoint.url for endpoint in probes + healthy + demoted]
+
+    def record(self, url: str, latency: float, ok: bool):
+        """Feed back the outcome of a request sent to `url`."""
+        now = time.monotonic()
+        with self._lock:
+            endpoint = next(e for e in self._endpoints if e.url == url)
+            endpoint.probe_started = 0.0
+            error = 0.0 if ok else 1.0
+            endpoint.error_rate += self.alpha * (error - endpoint.error_rate)
+            if ok:
+                endpoint.latency = (
+                    latency
+                    if endpoint.latency is None
+                    else endpoint.latency + self.alpha * (latency - endpoint.latency)
+                )
+                endpoint.failures = 0
+                if endpoint.demotions:
+                    # A successful probe restores the endpoint
+                    endpoint.demotions = 0
+                    endpoint.error_rate = 0.0
+                return
+
+            endpoint.failures += 1
+            # A demoted endpoint that fails its probe is demoted again
+            if (
+                endpoint.demotions
+                or endpoint.failures >= self.max_failures
+                or endpoint.error_rate >= self.error_threshold
+            ):
+                cooldown = self.cooldown * 2**endpoint.demotions
+                endpoint.demotions += 1
+                endpoint.demoted_until = now + min(cooldown, self.max_cooldown)
+                endpoint.failures = 0
+
+    def snapshot(self) -> List[Dict[str, Any]]:
+        """Health of every endpoint, in configuration order."""
+        now = time.monotonic()
+        with self._lock:
+            return [
+                {
+                    "url": endpoint.url,
+                    "latency_ms": None
+                    if endpoint.latency is None
+                    else endpoint.latency * 1000,
+                    "error_rate": endpoint.error_rate,
+                    "demoted": endpoint.demoted_until > now,
+                    "demotions": endpoint.demotions,
+                }
+                for endpoint in self._endpoints
+            ]
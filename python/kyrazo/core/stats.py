@@ -0,0 +1,50 @@
+import threading
+from typing import Dict, List
+
+
+class ClientStats:
+    """Thread-safe counters and timings describing an `HttpClient`."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters: Dict[str, int] = {}
+        # Per timing: count, total, max and last, in seconds
+        self._timings: Dict[str, List[float]] = {}
+
+    def increment(self, name: str, value: int = 1):
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + value
+
+    def get(self, name: str) -> int:
+        with self._lock:
+            return self._counters.get(name, 0)
+
+    def observe(self, name: str, seconds: float):
+        """Record one duration of `name`."""
+        with self._lock:
+            timing = self._timings.get(name)
+            if timing is None:
+                self._timings[name] = [1, seconds, seconds, seconds]
+                return
+            timing[0] += 1
+            timing[1] += seconds
+            timing[2] = max(timing[2], seconds)
+            timing[3] = seconds
+
+    def snapshot(self) -> Dict[str, int]:
+        """Return a copy of all counters."""
+        with self._lock:
+            return dict(self._counters)
+
+    def timings(self) -> Dict[str, Dict[str, float]]:
+        """Return count, average, maximum and last duration (ms) per timing."""
+        with self._lock:
+            return {
+                name: {
+                    "count": count,
+                    "avg_ms": total / count * 1000,
+                    "max_ms": longest * 1000,
+                    "last_ms": last * 1000,
+                }
+                for name, (count, total, longest, last) in self._timings.items()
+            }
@@ -0,0 +1,111 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Sequence, Tuple, Union
+from .client import Kyrazo
+from .core.fork import register_after_fork
+from .core.hedging import HedgePolicy
+from .core.http_client import HttpClient
+from .core.recorder import TrafficRecorder
+
+
+class KyrazoPool:
+    """
+    Serves many API keys (tenants) over one shared connection pool.
+
+    Every tenant gets a lightweight `Kyrazo` facade whose requests carry the
+    tenant's credentials but go through the pool's single `httpx` client, so
+    connections and TLS sessions are reused across tenants and socket counts
+    do not grow with the number of API keys. Facades are cached in an LRU of
+    at most `max_tenants` entries and dropped after `idle_timeout` seconds
+    without use; a dropped facade keeps working, it is simply rebuilt on the
+    next `get`.
+
+    Args:
+        base_url: The API base URL, or URLs to fail over between, shared by
+            all tenants.
+        timeout: Default request timeout in seconds.
+        retries: Connection retries.
+        hedge: Optional `HedgePolicy` shared by all tenants.
+        recorder: Optional `TrafficRecorder` shared by all tenants.
+        max_tenants: Maximum number of cached facades.
+        idle_timeout: Seconds after which an unused facade is dropped.
+    """
+
+    def __init__(
+        self,
+        base_url: Union[str, Sequence[str]] = "https://api.kyrazo.com",
+        timeout: int = 30,
+        retries: int = 3,
+        hedge: Optional[HedgePolicy] = None,
+        recorder: Optional[TrafficRecorder] = None,
+        max_tenants: int = 1000,
+        idle_timeout: float = 300.0,
+    ):
+        self._http_client = HttpClient(
+            "", base_url, timeout, retries, hedge=hedge, recorder=recorder
+        )
+        self.max_tenants = max_tenants
+        self.idle_timeout = idle_timeout
+        self._lock = threading.Lock()
+        self._tenants: "OrderedDict[str, Tuple[Kyrazo, float]]" = OrderedDict()
+        self._created = 0
+        self._evicted = 0
+        register_after_fork(self, "_reset_after_fork")
+
+    def _reset_after_fork(self):
+        self._lock = threading.Lock()
+
+    def get(self, api_key: str) -> Kyrazo:
+        """Return the client for `api_key`, creating it if needed."""
+        if not api_key:
+            raise ValueError("api_key must be a non-empty string")
+        now = time.monotonic()
+        with self._lock:
+            entry = self._tenants.get(api_key)
+            # A facade closed by its user is replaced rather than handed out
+            if entry is None or entry[0]._http_client._closed:
+                client = Kyrazo._from_http_client(
+                    HttpClient(api_key, shared=self._http_client)
+                )
+                self._created += 1
+            else:
+                client = entry[0]
+            self._tenants[api_key] = (client, now)
+            self._tenants.move_to_end(api_key)
+            self._evict(now)
+        return client
+
+    def _evict(self, now: float):
+        # The least recently used tenants are at the front
+        while self._tenants:
+            _, last_used = next(iter(self._tenants.values()))
+            if (
+                len(self._tenants) <= self.max_tenants
+                and now - last_used < self.idle_timeout
+            ):
+                break
+            self._tenants.popitem(last=False)
+            self._evicted += 1
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        """Counters for the tenant cache."""
+        with self._lock:
+            return {
+                "tenants": len(self._tenants),
+                "tenants_created": self._created,
+                "tenants_evicted": self._evicted,
+            }
+
+    def close(self):
+        """Close the shared connection pool; every facade stops working."""
+        with self._lock:
+            self._tenants.clear()
+        self._http_client.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
@@ -0,0 +1,95 @@
+import os
+import threading
+import weakref
+from typing import Any, Dict
+from .client import Kyrazo
+from .core.fork import register_after_fork
+
+
+class _ThreadClient:
+    """A thread's client, closed when the thread exits and drops it."""
+
+    __slots__ = ("client", "finalizer", "__weakref__")
+
+    def __init__(self, client: Kyrazo):
+        self.client = client
+        self.finalizer = weakref.finalize(self, client.close)
+
+
+class ClientProvider:
+    """
+    Hands out `Kyrazo` clients scoped to the current process or thread.
+
+    `Kyrazo` instances are thread- and fork-safe, so a single shared client is
+    usually enough. Use a provider when each worker process (or thread)
+    should own its client outright, e.g. in Celery prefork workers or
+    pre-fork web servers, while still reusing connections across tasks.
+    A thread's client is closed when the thread exits.
+
+    Args:
+        scope: "process" for one client per process, "thread" for one per thread.
+        **client_options: Keyword arguments passed to `Kyrazo`.
+    """
+
+    def __init__(self, scope: str = "process", **client_options: Any):
+        if scope not in ("process", "thread"):
+            raise ValueError("scope must be 'process' or 'thread'")
+        self.scope = scope
+        self._client_options = client_options
+        self._lock = threading.Lock()
+        self._clients: Dict[int, Kyrazo] = {}
+        self._local = threading.local()
+        self._thread_clients: "weakref.WeakSet[_ThreadClient]" = weakref.WeakSet()
+        register_after_fork(self, "_reset_after_fork")
+
+    def _reset_after_fork(self):
+        # Clients inherited from the parent are left to the parent
+        for holder in list(self._thread_clients):
+            holder.finalizer.detach()
+        self._lock = threading.Lock()
+        self._clients = {}
+        self._local = threading.local()
+        self._thread_clients = weakref.WeakSet()
+
+    def get(self) -> Kyrazo:
+        """Return the client for the current scope, creating it if needed."""
+        if self.scope == "thread":
+            return self._thread_client()
+        pid = os.getpid()
+        client = self._clients.get(pid)
+        if client is None:
+            with self._lock:
+                client = self._clients.get(pid)
+                if client is None:
+                    client = Kyrazo(**self._client_options)
+                    self._clients[pid] = client
+        return client
+
+    def _thread_client(self) -> Kyrazo:
+        # Thread-local storage is released when the thread exits, which
+        # closes the client instead of keeping it (and its pool) forever
+        holder = getattr(self._local, "holder", None)
+        if holder is None:
+            holder = _ThreadClient(Kyrazo(**self._client_options))
+            self._local.holder = holder
+            with self._lock:
+                self._thread_clients.add(holder)
+        return holder.client
+
+    def close(self):
+        """Close every client created by this provider in this process."""
+        with self._lock:
+            clients, self._clients = self._clients, {}
+            holders = list(self._thread_clients)
+            self._thread_clients = weakref.WeakSet()
+            self._local = threading.local()
+        for client in clients.values():
+            client.close()
+        for holder in holders:
+            holder.finalizer()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
@@ -0,0 +1,360 @@
+import asyncio
+import base64
+import hashlib
+import hmac
+import inspect
+import json
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple, Union
+
+from .resources.sources.models import Source, SourceAuthentication, SourceService
+
+try:
+    import orjson
+
+    _loads: Callable[[bytes], Any] = orjson.loads
+except ImportError:  # pragma: no cover - orjson is optional
+    _loads = json.loads
+
+Event = Dict[str, Any]
+Handler = Callable[[Event], Union[None, Awaitable[None]]]
+ErrorHandler = Callable[[Exception, Event], None]
+
+logger = logging.getLogger(__name__)
+
+# Stripe rejects signatures older than this by default
+STRIPE_TOLERANCE = 300
+
+
+def default_event_type(event: Event, headers: Dict[str, str]) -> Optional[str]:
+    """Kyrazo events carry `eventType`; service events (Stripe) carry `type`."""
+    return event.get("eventType") or event.get("type")
+
+
+def default_event_id(event: Event, headers: Dict[str, str]) -> Optional[str]:
+    return (
+        headers.get("idempotency-key")
+        or headers.get("x-event-id")
+        or event.get("eventId")
+        or event.get("id")
+    )
+
+
+class SourceAuthenticator:
+    """
+    Verifies incoming deliveries against a source's `authentication`.
+
+    `api_key` compares the configured header, `basic_auth` the
+    `Authorization` header, and `service` verifies the service's signature
+    over the raw body (Stripe's `Stripe-Signature`). All comparisons are
+    constant-time.
+    """
+
+    def __init__(
+        self,
+        authentication: Optional[SourceAuthentication],
+        service: Optional[SourceService] = None,
+        tolerance: int = STRIPE_TOLERANCE,
+    ):
+        self.authentication = authentication
+        self.service = service
+        self.tolerance = tolerance
+        auth = authentication
+        if auth is None or not auth.enabled:
+            return
+        if auth.type == "service" and service != "stripe":
+            # PayPal signatures can only be verified by calling PayPal
+            raise ValueError(f"Service authentication is not supported for {service}")
+        settings = {
+            "service": auth.service,
+            "api_key": auth.api_key,
+            "basic_auth": auth.basic_auth,
+        }.get(auth.type)
+        if not settings:
+            raise ValueError(f"Missing {auth.type} authentication settings")
+
+    def verify(self, headers: Dict[str, str], body: bytes) -> bool:
+        """Return whether a delivery is authentic. Header names are lowercase."""
+        auth = self.authentication
+        if auth is None or not auth.enabled:
+            return True
+        if auth.type == "api_key":
+            expected = auth.api_key["apiKey"]
+            received = headers.get(auth.api_key["headerKey"].lower(), "")
+            return hmac.compare_digest(received.encode(), expected.encode())
+        if auth.type == "basic_auth":
+            credentials = f"{auth.basic_auth['username']}:{auth.basic_auth['password']}"
+            expected = "Basic " + base64.b64encode(credentials.encode()).decode()
+            received = headers.get("authorization", "")
+            return hmac.compare_digest(received.encode(), expected.encode())
+        return self._verify_stripe(headers.get("stripe-signature", ""), body)
+
+    def _verify_stripe(self, header: str, body: bytes) -> bool:
+        timestamp, signatures = None, []
+        for part in header.split(","):
+            key, _, value = part.strip().partition("=")
+            if key == "t":
+                timestamp = value
+            elif key == "v1":
+                signatures.append(value)
+        if not timestamp or not timestamp.isdigit() or not signatures:
+            return False
+        if abs(time.time() - int(timestamp)) > self.tolerance:
+            return False
+        expected = hmac.new(
+            self.authentication.service["secret"].encode(),
+            timestamp.encode() + b"." + body,
+            hashlib.sha256,
+        ).hexdigest()
+        return any(hmac.compare_digest(expected, sig) for sig in signatures)
+
+
+class _SeenEvents:
+    """Recently accepted event IDs, bounded in size and age."""
+
+    def __init__(self, max_size: int, ttl: float):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._seen: "OrderedDict[str, float]" = OrderedDict()
+
+    def add(self, event_id: str) -> bool:
+        """Record an ID; returns False if it was already seen."""
+        now = time.monotonic()
+        while self._seen:
+            oldest, seen_at = next(iter(self._seen.items()))
+            if now - seen_at < self.ttl and len(self._seen) < self.max_size:
+                break
+            del self._seen[oldest]
+        if event_id in self._seen:
+            return False
+        self._seen[event_id] = now
+        return True
+
+    def discard(self, event_id: str):
+        self._seen.pop(event_id, None)
+
+
+class WebhookReceiver:
+    """
+    ASGI application receiving deliveries for a "receive" or "forward"
+    source.
+
+    Each POST is authenticated, parsed, deduplicated by event ID and queued
+    for the handler registered for its event type, then acknowledged with
+    202 straight away; handlers run on `workers` background tasks. When
+    `queue_size` events are waiting, deliveries are refused with 503 and a
+    `Retry-After` header so the sender backs off and retries later. An
+    event whose handler fails is forgotten by the deduplication, so its
+    redelivery is processed.
+
+    Handlers may be coroutines, or plain functions, which run in a thread.
+    JSON is parsed with orjson when it is installed.
+
+    Args:
+        authentication: The source's authentication settings.
+        service: The source's service, used by "service" authentication.
+        workers: Number of concurrent handler tasks.
+        queue_size: Accepted events that may wait for a worker.
+        max_body_size: Largest accepted body, in bytes.
+        dedup_size: Number of recent event IDs remembered.
+        dedup_ttl: Seconds an event ID is remembered.
+        retry_after: Seconds advertised in `Retry-After` when busy.
+        on_error: Called with the exception and event of a failed handler.
+            Exceptions it raises are logged.
+        event_type: Extracts the event type from an event and its headers.
+        event_id: Extracts the event ID from an event and its headers.
+    """
+
+    def __init__(
+        self,
+        authentication: Optional[SourceAuthentication] = None,
+        service: Optional[SourceService] = None,
+        workers: int = 8,
+        queue_size: int = 1000,
+        max_body_size: int = 1_000_000,
+        dedup_size: int = 100_000,
+        dedup_ttl: float = 86400.0,
+        retry_after: int = 1,
+        on_error: Optional[ErrorHandler] = None,
+        event_type: Callable[[Event, Dict[str, str]], Optional[str]] = (
+            default_event_type
+        ),
+        event_id: Callable[[Event, Dict[str, str]], Optional[str]] = default_event_id,
+    ):
+        self.authenticator = SourceAuthenticator(authentication, service)
+        self.workers = workers
+        self.queue_size = queue_size
+        self.max_body_size = max_body_size
+        self.retry_after = retry_after
+        self.on_error = on_error
+        self.event_type = event_type
+        self.event_id = event_id
+        self._handlers: Dict[str, Handler] = {}
+        self._seen = _SeenEvents(dedup_size, dedup_ttl)
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks: List[asyncio.Task] = []
+        self._counters = dict.fromkeys(
+            (
+                "received",
+                "accepted",
+                "duplicates",
+                "unauthorized",
+                "invalid",
+                "busy",
+                "unhandled",
+                "handled",
+                "failed",
+            ),
+            0,
+        )
+
+    @classmethod
+    def from_source(cls, source: Source, **options: Any) -> "WebhookReceiver":
+        """Build a receiver using a source's authentication settings."""
+        if source.type not in ("receive", "forward"):
+            raise ValueError(f"Source type '{source.type}' does not receive events")
+        return cls(source.authentication, source.service, **options)
+
+    def on(self, event_type: str) -> Callable[[Handler], Handler]:
+        """
+        Register the decorated function as the handler of `event_type`.
+        `"*"` registers a handler for event types without one.
+        """
+
+        def register(handler: Handler) -> Handler:
+            self._handlers[event_type] = handler
+            return handler
+
+        return register
+
+    def metrics(self) -> Dict[str, int]:
+        return {
+            **self._counters,
+            "queued": self._queue.qsize() if self._queue is not None else 0,
+        }
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "lifespan":
+            await self._lifespan(receive, send)
+        elif scope["type"] == "http":
+            status, headers = await self._receive(scope, receive)
+            await send(
+                {"type": "http.response.start", "status": status, "headers": headers}
+            )
+            await send({"type": "http.response.body", "body": b""})
+
+    async def _lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                self._start()
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                await self.close()
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    def _start(self):
+        if self._queue is None:
+            self._queue = asyncio.Queue(maxsize=self.queue_size)
+            self._tasks = [
+                asyncio.create_task(self._work()) for _ in range(self.workers)
+            ]
+
+    async def _receive(self, scope, receive) -> Tuple[int, List[Tuple[bytes, bytes]]]:
+        if scope["method"] != "POST":
+            return 405, [(b"allow", b"POST")]
+        self._counters["received"] += 1
+        # Servers that skip the lifespan protocol start the workers here
+        self._start()
+        if self._queue.full():
+            self._counters["busy"] += 1
+            return 503, [(b"retry-after", str(self.retry_after).encode())]
+
+        body = await self._read_body(receive)
+        if body is None:
+            self._counters["invalid"] += 1
+            return 413, []
+        headers = {
+            name.decode("latin-1").lower(): value.decode("latin-1")
+            for name, value in scope["headers"]
+        }
+        if not self.authenticator.verify(headers, body):
+            self._counters["unauthorized"] += 1
+            return 401, []
+        try:
+            event = _loads(body)
+        except ValueError:
+            event = None
+        if not isinstance(event, dict):
+            self._counters["invalid"] += 1
+            return 400, []
+
+        event_id = self.event_id(event, headers)
+        if event_id is not None and not self._seen.add(str(event_id)):
+            # Redeliveries are acknowledged so that the sender stops retrying
+            self._counters["duplicates"] += 1
+            return 200, []
+        handler = self._handlers.get(self.event_type(event, headers) or "")
+        handler = handler or self._handlers.get("*")
+        if handler is None:
+            self._counters["unhandled"] += 1
+            return 202, []
+        try:
+            self._queue.put_nowait((handler, event, event_id))
+        except asyncio.QueueFull:
+            if event_id is not None:
+                self._seen.discard(str(event_id))
+            self._counters["busy"] += 1
+            return 503, [(b"retry-after", str(self.retry_after).encode())]
+        self._counters["accepted"] += 1
+        return 202, []
+
+    async def _read_body(self, receive) -> Optional[bytes]:
+        chunks, size = [], 0
+        while True:
+            message = await receive()
+            chunk = message.get("body", b"")
+            size += len(chunk)
+            if size > self.max_body_size:
+                return None
+            chunks.append(chunk)
+            if not message.get("more_body", False):
+                return b"".join(chunks)
+
+    async def _work(self):
+        while True:
+            handler, event, event_id = await self._queue.get()
+            try:
+                if inspect.iscoroutinefunction(handler):
+                    await handler(event)
+                else:
+                    await asyncio.to_thread(handler, event)
+                self._counters["handled"] += 1
+            except Exception as e:
+                self._counters["failed"] += 1
+                if event_id is not None:
+                    self._seen.discard(str(event_id))
+                if self.on_error is not None:
+                    # A failing callback must not take down the worker task
+                    try:
+                        self.on_error(e, event)
+                    except Exception:
+                        logger.exception("Receiver on_error callback failed")
+            finally:
+                self._queue.task_done()
+
+    async def drain(self):
+        """Wait until every accepted event has been handled."""
+        if self._queue is not None:
+            await self._queue.join()
+
+    async def close(self):
+        """Handle the queued events, then stop the workers."""
+        await self.drain()
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._queue, self._tasks = None, []
@@ -0,0 +1,253 @@
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Literal, Optional, Tuple, Type
+
+from pydantic import BaseModel, ConfigDict, Field
+
+from .client import Kyrazo
+from .core.deadline import Deadline, resolve_deadline
+from .core.exceptions import KyrazoError
+from .resources.endpoints.models import CreateEndpointInput, UpdateEndpointInput
+from .resources.sources.models import CreateSourceInput, UpdateSourceInput
+from .resources.targets.models import CreateTargetInput, UpdateTargetInput
+
+ResourceKind = Literal["source", "endpoint", "target"]
+PlanActionType = Literal["create", "update", "delete"]
+
+# Create and update input models per resource kind
+RESOURCE_MODELS: Dict[str, Tuple[Type[BaseModel], Type[BaseModel]]] = {
+    "source": (CreateSourceInput, UpdateSourceInput),
+    "endpoint": (CreateEndpointInput, UpdateEndpointInput),
+    "target": (CreateTargetInput, UpdateTargetInput),
+}
+
+
+class DesiredState(BaseModel):
+    """
+    The resources a project should contain, identified by name.
+
+    A kind left as None is not managed; an empty list means the project
+    should have none of that kind (deletes require `prune=True`).
+    """
+
+    model_config = ConfigDict(populate_by_name=True)
+    sources: Optional[List[CreateSourceInput]] = None
+    endpoints: Optional[List[CreateEndpointInput]] = None
+    targets: Optional[List[CreateTargetInput]] = None
+
+
+class PlanAction(BaseModel):
+    model_config = ConfigDict(populate_by_name=True)
+    action: PlanActionType
+    kind: ResourceKind
+    name: str
+    resource_id: Optional[str] = None
+    payload: Dict[str, Any] = Field(
+        default_factory=dict,
+        description="Create body, or the minimal PATCH body for updates.",
+    )
+    changes: Dict[str, Tuple[Any, Any]] = Field(
+        default_factory=dict, description="Changed fields as (current, desired)."
+    )
+
+
+class Plan(BaseModel):
+    model_config = ConfigDict(populate_by_name=True)
+    actions: List[PlanAction] = Field(default_factory=list)
+    unchanged: int = 0
+    warnings: List[str] = Field(default_factory=list)
+
+    @property
+    def is_empty(self) -> bool:
+        return not self.actions
+
+    def summary(self) -> Dict[str, int]:
+        counts = {"create": 0, "update": 0, "delete": 0, "unchanged": self.unchanged}
+        for action in self.actions:
+            counts[action.action] += 1
+        return counts
+
+
+class ApplyResult(BaseModel):
+    model_config = ConfigDict(populate_by_name=True)
+    applied: List[PlanAction] = Field(default_factory=list)
+    failed: List[Tuple[PlanAction, str]] = Field(default_factory=list)
+
+
+def _without_none(value: Any) -> Any:
+    # The API omits unset values while models carry them as None
+    if isinstance(value, dict):
+        return {k: _without_none(v) for k, v in value.items() if v is not None}
+    if isinstance(value, list):
+        return [_without_none(v) for v in value]
+    return value
+
+
+def _alias(model: Type[BaseModel], field: str) -> str:
+    return model.model_fields[field].alias or field
+
+
+class Reconciler:
+    """
+    Brings a project's sources, endpoints and targets to a desired state
+    with as few API calls as possible.
+
+    `plan` fetches the current resources in bulk through the list endpoints
+    and diffs them field by field against the desired state, producing only
+    the creates, minimal PATCH payloads and (with `prune`) deletes that are
+    needed. `apply` executes a plan concurrently.
+
+    Args:
+        client: The client to use.
+        project_id: The project to reconcile.
+        prune: Delete resources that are not in the desired state.
+        max_workers: Maximum number of concurrent API calls in `apply`.
+    """
+
+    def __init__(
+        self,
+        client: Kyrazo,
+        project_id: str,
+        prune: bool = False,
+        max_workers: int = 8,
+    ):
+        self.client = client
+        self.project_id = project_id
+        self.prune = prune
+        self.max_workers = max_workers
+
+    def _resource_client(self, kind: str):
+        return getattr(self.client, f"{kind}s")
+
+    def plan(
+        self,
+        desired: DesiredState,
+        timeout: Optional[float] = None,
+        deadline: Optional[Deadline] = None,
+    ) -> Plan:
+        """Compute the changes needed to reach `desired`."""
+        deadline = resolve_deadline(timeout, deadline)
+        plan = Plan()
+        for kind in RESOURCE_MODELS:
+            wanted = getattr(desired, f"{kind}s")
+            if wanted is None:
+                continue
+            current = {
+                resource.name: resource
+                for resource in self._resource_client(kind).iter_all(
+                    self.project_id, deadline=deadline
+                )
+            }
+            self._plan_kind(plan, kind, wanted, current)
+        return plan
+
+    def _plan_kind(
+        self,
+        plan: Plan,
+        kind: str,
+        wanted: List[BaseModel],
+        current: Dict[str, BaseModel],
+    ):
+        _, update_model = RESOURCE_MODELS[kind]
+        names = [item.name for item in wanted]
+        duplicates = sorted(name for name, count in Counter(names).items() if count > 1)
+        if duplicates:
+            raise ValueError(f"Duplicate {kind} names: {', '.join(duplicates)}")
+
+        for item in wanted:
+            target = _without_none(item.model_dump(by_alias=True))
+            existing = current.get(item.name)
+            if existing is None:
+                plan.actions.append(
+                    PlanAction(
+                        action="create", kind=kind, name=item.name, payload=target
+                    )
+                )
+                continue
+
+            actual = _without_none(existing.model_dump(by_alias=True))
+            changes = {
+                key: (actual.get(key), value)
+                for key, value in target.items()
+                if actual.get(key) != value
+            }
+            updatable = {
+                _alias(update_model, field) for field in update_model.model_fields
+            }
+            for key in sorted(set(changes) - updatable):
+                plan.warnings.append(
+                    f"{kind} '{item.name}': '{key}' cannot be updated in place"
+                )
+                del changes[key]
+
+            if not changes:
+                plan.unchanged += 1
+                continue
+            plan.actions.append(
+                PlanAction(
+                    action="update",
+                    kind=kind,
+                    name=item.name,
+                    resource_id=existing.id,
+                    payload={key: value for key, (_, value) in changes.items()},
+                    changes=changes,
+                )
+            )
+
+        if self.prune:
+            for name in sorted(set(current) - set(names)):
+                plan.actions.append(
+                    PlanAction(
+                        action="delete",
+                        kind=kind,
+                        name=name,
+                        resource_id=current[name].id,
+                    )
+                )
+
+    def apply(
+        self,
+        plan: Plan,
+        timeout: Optional[float] = None,
+        deadline: Optional[Deadline] = None,
+    ) -> ApplyResult:
+        """
+        Execute a plan concurrently. Creates and updates run before deletes.
+
+        Failed actions are collected in the result instead of being raised.
+        """
+        deadline = resolve_deadline(timeout, deadline)
+        result = ApplyResult()
+        phases = [
+            [a for a in plan.actions if a.action != "delete"],
+            [a for a in plan.actions if a.action == "delete"],
+        ]
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            for actions in phases:
+                futures = [
+                    (action, executor.submit(self._apply_action, action, deadline))
+                    for action in actions
+                ]
+                for action, future in futures:
+                    try:
+                        future.result()
+                        result.applied.append(action)
+                    except KyrazoError as e:
+                        result.failed.append((action, str(e)))
+        return result
+
+    def _apply_action(self, action: PlanAction, deadline: Optional[Deadline]):
+        create_model, update_model = RESOURCE_MODELS[action.kind]
+        resources = self._resource_client(action.kind)
+        if action.action == "create":
+            return resources.create(
+                self.project_id, create_model(**action.payload), deadline=deadline
+            )
+        if action.action == "update":
+            return resources.update(
+                self.project_id,
+                action.resource_id,
+                update_model(**action.payload),
+                deadline=deadline,
+            )
+        return resources.delete(self.project_id, action.resource_id, deadline=deadline)
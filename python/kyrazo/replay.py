@@ -0,0 +1,289 @@
+import argparse
+import glob
+import json
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional
+
+from .client import Kyrazo
+from .core.exceptions import KyrazoError
+
+# Headers that are set by the client itself and must not be replayed
+SKIPPED_HEADERS = frozenset(
+    {
+        "authorization",
+        "x-api-key",
+        "host",
+        "content-length",
+        "content-type",
+        "user-agent",
+        "accept",
+        "accept-encoding",
+        "connection",
+        # Replaced by a fresh key, so replays are not deduplicated
+        "idempotency-key",
+    }
+)
+PLACEHOLDERS = {"{project_id}": "proj_replay", "{id}": "id_replay"}
+
+
+def load_records(path: str) -> List[Dict[str, Any]]:
+    """
+    Load records from a recorder log and its rotated backups, oldest first.
+    """
+    # Rotated backups are named <path>.1 (newest) to <path>.N (oldest)
+    backups = [
+        name
+        for name in glob.glob(glob.escape(path) + ".*")
+        if name.rsplit(".", 1)[1].isdigit()
+    ]
+    backups.sort(key=lambda name: int(name.rsplit(".", 1)[1]), reverse=True)
+    records = []
+    for name in backups + [path]:
+        if not os.path.exists(name):
+            continue
+        with open(name, encoding="utf-8") as f:
+            records.extend(json.loads(line) for line in f if line.strip())
+    records.sort(key=lambda record: record["t"])
+    return records
+
+
+def synthetic_body(size: int) -> bytes:
+    """A JSON object of exactly `size` bytes (at least `{}`)."""
+    padding = size - len(b'{"pad":""}')
+    if padding < 0:
+        return b"{}"
+    return b'{"pad":"' + b"x" * padding + b'"}'
+
+
+def percentile(ordered: List[float], fraction: float) -> float:
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+class ReplayReport:
+    """Latency distribution of a replay, overall and per route."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._latencies: Dict[str, List[float]] = {}
+        self._errors: Dict[str, int] = {}
+        self.duration = 0.0
+
+    def add(self, route: str, latency: float, error: bool):
+        with self._lock:
+            self._latencies.setdefault(route, []).append(latency)
+            if error:
+                self._errors[route] = self._errors.get(route, 0) + 1
+
+    @staticmethod
+    def _summarize(latencies: List[float], errors: int) -> Dict[str, float]:
+        ordered = sorted(latencies)
+        return {
+            "count": len(ordered),
+            "errors": errors,
+            "p50_ms": percentile(ordered, 0.50) * 1000,
+            "p90_ms": percentile(ordered, 0.90) * 1000,
+            "p99_ms": percentile(ordered, 0.99) * 1000,
+            "max_ms": (ordered[-1] if ordered else 0.0) * 1000,
+        }
+
+    def as_dict(self) -> Dict[str, Dict[str, float]]:
+        """Summary keyed by "METHOD path", plus an "all" entry."""
+        with self._lock:
+            summary = {
+                route: self._summarize(latencies, self._errors.get(route, 0))
+                for route, latencies in sorted(self._latencies.items())
+            }
+            every = [
+                latency for values in self._latencies.values() for latency in values
+            ]
+            summary["all"] = self._summarize(every, sum(self._errors.values()))
+        return summary
+
+    def __str__(self) -> str:
+        lines = [
+            f"{'route':<50} {'count':>7} {'errors':>6} {'p50':>9} {'p90':>9} "
+            f"{'p99':>9} {'max':>9}"
+        ]
+        for route, stats in self.as_dict().items():
+            lines.append(
+                f"{route:<50} {stats['count']:>7} {stats['errors']:>6} "
+                f"{stats['p50_ms']:>8.2f}ms {stats['p90_ms']:>7.2f}ms "
+                f"{stats['p99_ms']:>7.2f}ms {stats['max_ms']:>7.2f}ms"
+            )
+        return "\n".join(lines)
+
+
+class TrafficReplayer:
+    """
+    Re-issues requests captured with `TrafficRecorder` through a `Kyrazo`
+    client. Bodies are synthesized with the recorded size, since payloads
+    are never captured.
+
+    Requests are scheduled open-loop at their recorded offsets divided by
+    `rate`, so a slow client cannot slow down the workload; latency is
+    measured from the scheduled time, which includes any queueing in the
+    client. A `rate` of 0 replays as fast as possible.
+
+    Args:
+        client: The client to send requests through.
+        records: Records loaded with `load_records`.
+        rate: Speed-up factor relative to the recorded pace.
+        concurrency: Maximum number of requests in flight.
+    """
+
+    def __init__(
+        self,
+        client: Kyrazo,
+        records: List[Dict[str, Any]],
+        rate: float = 1.0,
+        concurrency: int = 32,
+    ):
+        self.client = client
+        self.records = records
+        self.rate = rate
+        self.concurrency = concurrency
+
+    def _send(self, record: Dict[str, Any], report: ReplayReport, scheduled: float):
+        path = record["p"]
+        for placeholder, value in PLACEHOLDERS.items():
+            path = path.replace(placeholder, value)
+        headers = {
+            name: value
+            for name, value in record.get("h", {}).items()
+            if name not in SKIPPED_HEADERS
+        }
+        if "idempotency-key" in record.get("h", {}):
+            headers["Idempotency-Key"] = str(uuid.uuid4())
+        content = synthetic_body(record["b"]) if record["m"] != "GET" else None
+
+        error = False
+        try:
+            self.client._http_client.request(
+                record["m"], path, headers=headers, content=content
+            )
+        except KyrazoError:
+            error = True
+        report.add(f"{record['m']} {record['p']}", time.monotonic() - scheduled, error)
+
+    def run(self) -> ReplayReport:
+        """Replay every record and return the latency report."""
+        report = ReplayReport()
+        if not self.records:
+            return report
+
+        first = self.records[0]["t"]
+        started = time.monotonic()
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            for record in self.records:
+                offset = (record["t"] - first) / self.rate if self.rate else 0.0
+                scheduled = started + offset
+                delay = scheduled - time.monotonic()
+                if delay > 0:
+                    time.sleep(delay)
+                executor.submit(self._send, record, report, scheduled)
+        report.duration = time.monotonic() - started
+        return report
+
+
+class _StandInHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def _respond(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        if length:
+            self.rfile.read(length)
+        if self.server.latency:
+            time.sleep(self.server.latency)
+        body = b'{"success":true,"data":{}}'
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    do_GET = do_POST = do_PUT = do_PATCH = do_DELETE = _respond
+
+    def do_HEAD(self):
+        self.send_response(200)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, format, *args):
+        pass
+
+
+class StandInServer:
+    """
+    A local HTTP server answering every request with a small JSON body, used
+    as the target of a replay.
+
+    Args:
+        latency: Seconds the server waits before responding.
+        host: Interface to bind to.
+        port: Port to bind to; 0 picks a free one.
+    """
+
+    def __init__(self, latency: float = 0.0, host: str = "127.0.0.1", port: int = 0):
+        self._server = ThreadingHTTPServer((host, port), _StandInHandler)
+        self._server.daemon_threads = True
+        self._server.latency = latency
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "StandInServer":
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, name="kyrazo-stand-in", daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Replay recorded Kyrazo traffic.")
+    parser.add_argument("log", help="Recorder log file")
+    parser.add_argument("--rate", type=float, default=1.0, help="Speed-up factor")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument(
+        "--latency", type=float, default=0.0, help="Stand-in server latency (s)"
+    )
+    parser.add_argument(
+        "--base-url", help="Replay against this URL instead of a stand-in server"
+    )
+    args = parser.parse_args(argv)
+
+    records = load_records(args.log)
+    server = None if args.base_url else StandInServer(latency=args.latency).start()
+    try:
+        with Kyrazo(api_key="replay", base_url=args.base_url or server.url) as client:
+            report = TrafficReplayer(
+                client, records, rate=args.rate, concurrency=args.concurrency
+            ).run()
+    finally:
+        if server is not None:
+            server.stop()
+    print(report)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,6 @@
-from typing import List, Optional, Any
+from typing import List, Optional, Any, Iterator
 from ...core.http_client import HttpClient
+from ...core.deadline import Deadline
 from .models import Endpoint, CreateEndpointInput, UpdateEndpointInput
 
 
@@ -7,33 +8,107 @@ class EndpointsClient:
     def __init__(self, http_client: HttpClient):
         self._http_client = http_client
 
-    def list(self, project_id: str, params: Optional[dict] = None) -> Any:
-        return self._http_client.get(f"/v1/endpoints/{project_id}", params=params)
+    def list(
+        self,
+        project_id: str,
+        params: Optional[dict] = None,
+        timeout: Optional[float] = None,
+        deadline: Optional[Deadline] = None,
+    ) -> Any:
+        return self._http_client.get(
+            f"/v1/endpoints/{project_id}",
+            params=params,
+            timeout=timeout,
+            deadline=deadline,
+        )
+
+    def iter_all(
+        self,
+        project_id: str,
+        params: Optional[dict] = None,
+        timeout: Optional[float] = None,
+        deadline: Optional[Deadline] = None,
+    ) -> Iterator[Endpoint]:
+        """Iterate over every endpoint, fetching pages as needed."""
+        for item in self._http_client.paginate(
+            f"/v1/endpoints/{project_id}",
+            params=params,
+            timeout=timeout,
+            deadline=deadline,
+        ):
+            yield Endpoint(**item)
 
-    def get(self, project_id: str, endpoint_id: str) -> Endpoint:
-        response = self._http_client.get(f"/v1/endpoints/{project_id}/{endpoint_id}")
+    def get(
+        self,
+        project_id: str,
+        endpoint_id: str,
+        timeout: Optional[float] = None,
+        deadline: Optional[Deadline] = None,
+    ) -> Endpoint:
+        response = self._http_client.get(
+            f"/v1/endpoints/{project_id}/{endpoint_id}",
+            timeout=timeout,
+            deadline=deadline,
+        )
         return Endpoint(**response.get("data"))
 
-    def create(self, project_id: str, data: CreateEndpointInput) -> Endpoint:
+    def create(
+        self,
+        project_id: str,
+        data: CreateEndpointInput,
+        timeout: Optional[float] = None,
+        deadline: Optional[Deadline] = None,
+    ) -> Endpoint:
         payload = data.model_dump(by_alias=True, exclude_none=True)
-        response = self._http_client.post(f"/v1/endpoints/{project_id}", data=payload)
+        response = self._http_client.post(
+            f"/v1/endpoints/{project_id}",
+            data=payload,
+            timeout=timeout,
+            deadline=deadline,
+        )
         return Endpoint(**response.get("data"))
 
     def update(
-        self, project_id: str, endpoint_id: str, data: UpdateEndpointInput
+        self,
+        project_id: str,
+        endpoint_id: str,
+        data: UpdateEndpointInput,
+        timeout: Optional[float] = None,
+        deadline: Optional[Deadline] = None,
     ) -> Endpoint:
         payload = data.model_dump(by_alias=True, exclude_none=True)
         response = self._http_client.patch(
-            f"/v1/endpoints/{project_id}/{endpoint_id}", data=payload
+            f"/v1/endpoints/{project_id}/{endpoint_id}",
+            data=payload,
+            timeout=timeout,
+            deadline=deadline,
         )
         return Endpoint(**response.get("data"))
 
-    def delete(self, project_id: str, endpoint_id: str) -> bool:
-        response = self._http_client.delete(f"/v1/endpoints/{project_id}/{endpoint_id}")
+    def delete(
+        self,
+        project_id: str,
+        endpoint_id: str,
+        timeout: Optional[float] = None,
+        deadline: Optional[Deadline] = None,
+    ) -> bool:
+        response = self._http_client.delete(
+            f"/v1/endpoints/{project_id}/{endpoint_id}",
+            timeout=timeout,
+            deadline=deadline,
+        )
         return response.get("success", False)
 
-    def get_secret(self, project_id: str, endpoint_id: str) -> str:
+    def get_secret(
+        self,
+        project_id: str,
+        endpoint_id: str,
+        timeout: Optional[float] = None,
+        deadline: Optional[Deadline] = None,
+    ) -> str:
         response = self._http_client.get(
-            f"/v1/endpoints/{project_id}/{endpoint_id}/secret"
+            f"/v1/endpoints/{project_id}/{endpoint_id}/secret",
+            timeout=timeout,
+            deadline=deadline,
         )
         return response.get("data", {}).get("secret")
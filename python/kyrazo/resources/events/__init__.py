@@ -3,15 +3,28 @@ from .models import (
     PublishEventBody,
     PublishEventResponse,
     BatchPublishEventResponse,
+    BatchEventOutcome,
+    BatchPublishResult,
     TargetInput,
     EventMeta,
 )
+from .template import EventTemplate, PreparedEvent
+from .publisher import BufferedPublisher
+from .batching import AdaptiveBatchController
+from .coalescing import EventCoalescer
 
 __all__ = [
     "EventsClient",
     "PublishEventBody",
     "PublishEventResponse",
     "BatchPublishEventResponse",
+    "BatchEventOutcome",
+    "BatchPublishResult",
     "TargetInput",
     "EventMeta",
+    "EventTemplate",
+    "PreparedEvent",
+    "BufferedPublisher",
+    "AdaptiveBatchController",
+    "EventCoalescer",
 ]
@@ -0,0 +1,114 @@
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict, Optional, Tuple
+
+
+class AdaptiveBatchController:
+    """
+    Tunes the batch size of buffered publishing with an AIMD loop.
+
+    After each batch the controller is told how long the round trip took,
+    the server's `processingTimeMs` when known, and whether the request
+    failed or was rate limited. While both latencies stay under
+    `target_latency` and batches are filling up, the target size grows by
+    `increase` events; a slow batch, an error or a 429 multiplies it by
+    `decrease`. Independently of the count, `BufferedPublisher` never
+    builds a batch over `max_bytes` of encoded events.
+
+    With retries (`BufferedPublisher(max_attempts=...)`), every request of
+    `EventsClient.batch_with_retry` is recorded on its own, so rate limits
+    and backoff delays are not mistaken for slow batches.
+
+    Args:
+        initial_size: Starting target batch size.
+        min_size: Lowest target batch size.
+        max_size: Highest target batch size (the API accepts 100).
+        max_bytes: Maximum encoded size of a batch, in bytes.
+        target_latency: Round-trip latency, in seconds, above which the
+            batch size is reduced.
+        increase: Events added to the target after a healthy full batch.
+        decrease: Factor applied to the target after a slow or failed batch.
+        history: Number of recent size changes kept for metrics.
+    """
+
+    def __init__(
+        self,
+        initial_size: int = 20,
+        min_size: int = 1,
+        max_size: int = 100,
+        max_bytes: int = 1_000_000,
+        target_latency: float = 0.5,
+        increase: int = 5,
+        decrease: float = 0.5,
+        history: int = 100,
+    ):
+        if not 1 <= min_size <= initial_size <= max_size:
+            raise ValueError("expected 1 <= min_size <= initial_size <= max_size")
+        if not 0 < decrease < 1:
+            raise ValueError("decrease must be between 0 and 1")
+
+        self.min_size = min_size
+        self.max_size = max_size
+        self.max_bytes = max_bytes
+        self.target_latency = target_latency
+        self.increase = increase
+        self.decrease = decrease
+
+        self._lock = threading.Lock()
+        self._size = float(initial_size)
+        self._history: Deque[Tuple[float, int]] = deque(maxlen=history)
+        self._history.append((time.time(), initial_size))
+        self._batches = 0
+        self._errors = 0
+        self._last_latency: Optional[float] = None
+
+    @property
+    def size(self) -> int:
+        """Current target number of events per batch."""
+        with self._lock:
+            return int(self._size)
+
+    def record(
+        self,
+        count: int,
+        latency: float,
+        processing_time_ms: Optional[int] = None,
+        error: bool = False,
+        rate_limited: bool = False,
+    ):
+        """Feed back the outcome of a batch of `count` events."""
+        with self._lock:
+            self._batches += 1
+            self._last_latency = latency
+            server_time = (processing_time_ms or 0) / 1000
+            if error or rate_limited:
+                self._errors += 1
+                size = self._size * self.decrease
+            elif latency > self.target_latency or server_time > self.target_latency:
+                size = self._size * self.decrease
+            elif count >= int(self._size):
+                # Only full batches say anything about a larger size
+                size = self._size + self.increase
+            else:
+                return
+            size = min(float(self.max_size), max(float(self.min_size), size))
+            if int(size) != int(self._size):
+                self._history.append((time.time(), int(size)))
+            self._size = size
+
+    def metrics(self) -> Dict[str, Any]:
+        """The current size and its recent history as (timestamp, size) pairs."""
+        with self._lock:
+            return {
+                "size": int(self._size),
+                "min_size": self.min_size,
+                "max_size": self.max_size,
+                "max_bytes": self.max_bytes,
+                "batches": self._batches,
+                "errors": self._errors,
+                "last_latency_ms": None
+                if self._last_latency is None
+                else self._last_latency * 1000,
+                "history": list(self._history),
+            }
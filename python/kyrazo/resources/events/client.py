@@ -1,54 +1,332 @@
-from typing import List, Optional, Dict, Any
+import time
+from typing import Callable, List, Optional, Dict, Any, Tuple, Union
 from ...core.http_client import HttpClient
-from .models import PublishEventBody, PublishEventResponse, BatchPublishEventResponse
+from ...core.deadline import Deadline, resolve_deadline
+from ...core.exceptions import (
+    KyrazoError,
+    NetworkError,
+    RateLimitError,
+    ServerError,
+)
+from .models import (
+    PublishEventResponse,
+    BatchPublishEventResponse,
+    BatchPublishEventResponseItem,
+    BatchEventOutcome,
+    BatchPublishResult,
+    TargetInput,
+    EventMeta,
+)
+from .template import (
+    EventBody,
+    EventTemplate,
+    PreparedEvent,
+    encode_batch,
+    encode_event,
+)
+from .batching import AdaptiveBatchController
+from .publisher import BufferedPublisher
+
+RetryClassifier = Callable[[BatchPublishEventResponseItem], bool]
+
+# Substrings of per-item errors that indicate a transient failure
+RETRYABLE_ERROR_HINTS = (
+    "timeout",
+    "timed out",
+    "rate limit",
+    "too many",
+    "temporar",
+    "unavailable",
+    "internal",
+    "try again",
+    "connection",
+    "overload",
+)
+
+
+def is_retryable_item(item: BatchPublishEventResponseItem) -> bool:
+    """Default classifier: treat per-item errors that look transient as retryable."""
+    error = (item.error or "").lower()
+    return any(hint in error for hint in RETRYABLE_ERROR_HINTS)
 
 
 class EventsClient:
     def __init__(self, http_client: HttpClient):
         self._http_client = http_client
 
+    def template(
+        self,
+        webhook_id: str,
+        targets: List[Union[TargetInput, Dict[str, Any]]],
+        meta: Optional[Union[EventMeta, Dict[str, Any]]] = None,
+    ) -> EventTemplate:
+        """
+        Create an event template for publishing many events that share the
+        same webhook, targets and meta.
+
+        Args:
+            webhook_id: The webhook ID.
+            targets: The targets every event is sent to.
+            meta: Optional event meta.
+        """
+        return EventTemplate(webhook_id, targets, meta=meta)
+
+    def publisher(self, project_id: str, **options: Any) -> BufferedPublisher:
+        """
+        Create a `BufferedPublisher` that batches events for `project_id` in
+        the background, scheduling them by priority.
+
+        Args:
+            project_id: The project ID.
+            **options: Options passed to `BufferedPublisher`.
+        """
+        return BufferedPublisher(self, project_id, **options)
+
     def publish(
         self,
         project_id: str,
-        body: PublishEventBody,
+        body: EventBody,
         idempotency_key: Optional[str] = None,
+        timeout: Optional[float] = None,
+        deadline: Optional[Deadline] = None,
     ) -> PublishEventResponse:
         """
         Publish a single event.
 
         Args:
             project_id: The project ID.
-            body: The event data (validated by Pydantic model).
+            body: The event data (validated by Pydantic model), or a
+                `PreparedEvent` built from an `EventTemplate`.
             idempotency_key: Optional key for idempotency.
+            timeout: Optional per-call timeout in seconds.
+            deadline: Optional `Deadline` shared with other calls.
         """
         headers = {}
         if idempotency_key:
             headers["Idempotency-Key"] = idempotency_key
 
-        # Dump model to dict, using aliases (camelCase) for the API
-        data = body.model_dump(by_alias=True, exclude_none=True)
-
-        response_data = self._http_client.post(
-            f"/v1/events/{project_id}/publish", data=data, headers=headers
-        )
+        path = f"/v1/events/{project_id}/publish"
+        if isinstance(body, PreparedEvent):
+            response_data = self._http_client.post(
+                path,
+                headers=headers,
+                content=body.content,
+                timeout=timeout,
+                deadline=deadline,
+            )
+        else:
+            # Dump model to dict, using aliases (camelCase) for the API
+            data = body.model_dump(by_alias=True, exclude_none=True)
+            response_data = self._http_client.post(
+                path, data=data, headers=headers, timeout=timeout, deadline=deadline
+            )
         return PublishEventResponse(**response_data)
 
     def batch(
         self,
         project_id: str,
-        events: List[PublishEventBody],
+        events: List[EventBody],
         idempotency_key: Optional[str] = None,
+        timeout: Optional[float] = None,
+        deadline: Optional[Deadline] = None,
     ) -> BatchPublishEventResponse:
         """
         Publish a batch of events.
+
+        Events may be `PublishEventBody` models, `PreparedEvent`s, or a mix.
         """
         headers = {}
         if idempotency_key:
             headers["Idempotency-Key"] = idempotency_key
 
-        data = [evt.model_dump(by_alias=True, exclude_none=True) for evt in events]
+        path = f"/v1/events/{project_id}/publish/batch"
+        if any(isinstance(evt, PreparedEvent) for evt in events):
+            content = encode_batch(events)
+            response_data = self._http_client.post(
+                path,
+                headers=headers,
+                content=content,
+                timeout=timeout,
+                deadline=deadline,
+            )
+        else:
+            data = [evt.model_dump(by_alias=True, exclude_none=True) for evt in events]
+            response_data = self._http_client.post(
+                path, data=data, headers=headers, timeout=timeout, deadline=deadline
+            )
+        return BatchPublishEventResponse(**response_data)
 
-        response_data = self._http_client.post(
-            f"/v1/events/{project_id}/publish/batch", data=data, headers=headers
+    def batch_with_retry(
+        self,
+        project_id: str,
+        events: List[EventBody],
+        idempotency_key: Optional[str] = None,
+        max_attempts: int = 3,
+        max_batch_size: int = 100,
+        backoff: float = 0.5,
+        max_backoff: float = 10.0,
+        is_retryable: RetryClassifier = is_retryable_item,
+        timeout: Optional[float] = None,
+        deadline: Optional[Deadline] = None,
+        batch_controller: Optional[AdaptiveBatchController] = None,
+    ) -> BatchPublishResult:
+        """
+        Publish a batch of events, resubmitting only the items that failed
+        with a retryable error.
+
+        Results are mapped back to the input events. Retryable failures from
+        every chunk are coalesced into follow-up batches sent with exponential
+        backoff; rate-limited, 5xx and network failures of a whole request are
+        retried the same way. Each event gets exactly one outcome in the
+        result, in input order, and events that finally failed are also
+        listed in `dead_letters`.
+
+        Args:
+            project_id: The project ID.
+            events: The events to publish.
+            idempotency_key: Optional base key. Each chunk is sent with
+                "<key>-<attempt>-<chunk>", where `attempt` is the attempt that
+                formed it. A chunk resent after a rate-limited, 5xx or network
+                failure keeps its key, so the API deduplicates it if the
+                failed request was in fact accepted. Follow-up batches of
+                failed items get new keys, so they are never deduplicated
+                against the original batch. Without a key, resending a whole
+                request can publish its events twice.
+            max_attempts: Maximum submissions per event.
+            max_batch_size: Maximum events per batch request.
+            backoff: Initial delay between attempts, in seconds.
+            max_backoff: Maximum delay between attempts, in seconds.
+            is_retryable: Classifies a failed response item as retryable.
+            timeout: Optional timeout in seconds covering all attempts.
+            deadline: Optional `Deadline` covering all attempts.
+            batch_controller: Optional `AdaptiveBatchController` told the
+                outcome of every request, excluding backoff delays.
+        """
+        deadline = resolve_deadline(timeout, deadline)
+        # Encode once; follow-up batches splice the same bytes
+        prepared = [
+            evt
+            if isinstance(evt, PreparedEvent)
+            else PreparedEvent(evt.event_type, encode_event(evt))
+            for evt in events
+        ]
+        outcomes: Dict[int, BatchEventOutcome] = {}
+        pending = list(range(len(events)))
+        # Chunks whose whole request failed, resent as-is with their key
+        resend: List[Tuple[List[int], Optional[str]]] = []
+        attempt = 0
+
+        while pending and attempt < max_attempts:
+            attempt += 1
+            retry: List[int] = []
+            failed_chunks: List[Tuple[List[int], Optional[str]]] = []
+            retry_after = 0.0
+
+            resent = {i for chunk, _ in resend for i in chunk}
+            fresh = [i for i in pending if i not in resent]
+            chunks = resend + [
+                (
+                    fresh[start : start + max_batch_size],
+                    f"{idempotency_key}-{attempt}-{number}"
+                    if idempotency_key
+                    else None,
+                )
+                for number, start in enumerate(range(0, len(fresh), max_batch_size))
+            ]
+
+            for chunk, key in chunks:
+                sent_at = time.monotonic()
+                try:
+                    response = self.batch(
+                        project_id,
+                        [prepared[i] for i in chunk],
+                        idempotency_key=key,
+                        deadline=deadline,
+                    )
+                except (RateLimitError, ServerError, NetworkError) as e:
+                    self._observe(batch_controller, len(chunk), sent_at, error=e)
+                    if isinstance(e, RateLimitError) and e.retry_after:
+                        retry_after = max(retry_after, float(e.retry_after))
+                    for i in chunk:
+                        outcomes[i] = self._failed_outcome(i, events[i], str(e), True)
+                    # The request may have been accepted before it failed
+                    failed_chunks.append((chunk, key))
+                    continue
+                except KyrazoError as e:
+                    self._observe(batch_controller, len(chunk), sent_at, error=e)
+                    for i in chunk:
+                        outcomes[i] = self._failed_outcome(i, events[i], str(e), False)
+                    continue
+                self._observe(batch_controller, len(chunk), sent_at, response=response)
+
+                for position, i in enumerate(chunk):
+                    if position >= len(response.results):
+                        outcome = self._failed_outcome(
+                            i, events[i], "Missing result for event", True
+                        )
+                    else:
+                        item = response.results[position]
+                        failed = item.status == "failed" or item.error is not None
+                        outcome = BatchEventOutcome(
+                            index=i,
+                            event=events[i],
+                            status=item.status,
+                            event_id=item.event_id,
+                            targets_count=item.targets_count,
+                            error=item.error,
+                            retryable=failed and is_retryable(item),
+                        )
+                    outcomes[i] = outcome
+                    if outcome.retryable:
+                        retry.append(i)
+
+            for i in pending:
+                outcomes[i].attempts = attempt
+            resend = failed_chunks
+            pending = [i for chunk, _ in resend for i in chunk] + retry
+
+            if pending and attempt < max_attempts:
+                delay = max(retry_after, min(max_backoff, backoff * 2 ** (attempt - 1)))
+                if deadline is not None and delay >= deadline.remaining():
+                    break
+                time.sleep(delay)
+
+        results = [outcomes[i] for i in range(len(events))]
+        return BatchPublishResult(
+            results=results,
+            dead_letters=[
+                item for item in results if item.status == "failed" or item.error
+            ],
+            attempts=attempt,
+        )
+
+    @staticmethod
+    def _observe(
+        controller: Optional[AdaptiveBatchController],
+        count: int,
+        sent_at: float,
+        error: Optional[KyrazoError] = None,
+        response: Optional[BatchPublishEventResponse] = None,
+    ):
+        if controller is None:
+            return
+        rate_limited = isinstance(error, RateLimitError)
+        controller.record(
+            count,
+            time.monotonic() - sent_at,
+            response.processing_time_ms if response is not None else None,
+            error=error is not None and not rate_limited,
+            rate_limited=rate_limited,
+        )
+
+    @staticmethod
+    def _failed_outcome(
+        index: int, event: EventBody, error: str, retryable: bool
+    ) -> BatchEventOutcome:
+        return BatchEventOutcome(
+            index=index,
+            event=event,
+            status="failed",
+            error=error,
+            retryable=retryable,
         )
-        return BatchPublishEventResponse(**response_data)
@@ -0,0 +1,99 @@
+import threading
+from typing import Any, Callable, Dict, Hashable, Iterable, Optional, Tuple
+
+from .models import PublishEventBody
+from .template import EventBody, PreparedEvent
+
+KeyExtractor = Callable[[Dict[str, Any]], Optional[Hashable]]
+MergeFunction = Callable[[PublishEventBody, PublishEventBody], PublishEventBody]
+
+
+class EventCoalescer:
+    """
+    Collapses redundant events in buffered publishing.
+
+    Events of the same webhook, targets and event type whose payloads share
+    a key, as returned by `key`, are held for `window` seconds after the
+    first of them arrives. Only one event is then published: the latest,
+    or the result of folding them with `merge(previous, latest)`. Events
+    for which `key` returns None, prepared events and, with `event_types`,
+    events of other types are never held.
+
+    Args:
+        key: Extracts the coalescing key from an event payload.
+        window: Seconds an event is held for newer events with its key.
+        event_types: Event types to coalesce; None coalesces all of them.
+        merge: Combines a held event with a newer one. The newer event
+            replaces the held one when omitted.
+    """
+
+    def __init__(
+        self,
+        key: KeyExtractor,
+        window: float = 1.0,
+        event_types: Optional[Iterable[str]] = None,
+        merge: Optional[MergeFunction] = None,
+    ):
+        if window <= 0:
+            raise ValueError("window must be positive")
+
+        self._key = key
+        self.window = window
+        self.event_types = None if event_types is None else frozenset(event_types)
+        self.merge = merge
+
+        self._lock = threading.Lock()
+        self._received = 0
+        self._emitted = 0
+        self._dropped = 0
+
+    def key(self, event: EventBody) -> Optional[Tuple[Hashable, ...]]:
+        """The coalescing key of an event, or None if it is not coalesced."""
+        if isinstance(event, PreparedEvent):
+            return None
+        if self.event_types is not None and event.event_type not in self.event_types:
+            return None
+        value = self._key(event.payload)
+        if value is None:
+            return None
+        targets = tuple((t.target_id, t.target_url) for t in event.targets)
+        return (event.webhook_id, targets, event.event_type, value)
+
+    def combine(
+        self, previous: PublishEventBody, latest: PublishEventBody
+    ) -> PublishEventBody:
+        """Fold a newer event into a held one, counting it as received."""
+        with self._lock:
+            self._received += 1
+        if self.merge is None:
+            return latest
+        return self.merge(previous, latest)
+
+    def hold(self):
+        """Count an event that starts a new window."""
+        with self._lock:
+            self._received += 1
+
+    def emit(self):
+        """Count an event released from its window for publishing."""
+        with self._lock:
+            self._emitted += 1
+
+    def drop(self):
+        """Count a held event that was shed before it could be released."""
+        with self._lock:
+            self._dropped += 1
+
+    def metrics(self) -> Dict[str, float]:
+        """Events received, emitted and dropped, and the fraction collapsed."""
+        with self._lock:
+            received, emitted, dropped = self._received, self._emitted, self._dropped
+        collapsed = received - emitted - dropped
+        return {
+            "window": self.window,
+            "received": received,
+            "emitted": emitted,
+            "dropped": dropped,
+            "collapsed": collapsed,
+            "collapse_ratio": collapsed / received if received else 0.0,
+        }
@@ -55,3 +55,34 @@ class BatchPublishEventResponse(BaseModel):
     results: List[BatchPublishEventResponseItem]
     queued_at: str = Field(..., alias="queuedAt")
     processing_time_ms: int = Field(..., alias="processingTimeMs")
+
+
+class BatchEventOutcome(BaseModel):
+    """Final outcome of one event submitted through `batch_with_retry`."""
+
+    model_config = ConfigDict(populate_by_name=True, arbitrary_types_allowed=True)
+    index: int = Field(..., description="Position of the event in the input list.")
+    event: Any = Field(..., description="The event as it was submitted.")
+    status: str
+    event_id: Optional[str] = Field(None, alias="eventId")
+    targets_count: Optional[int] = Field(None, alias="targetsCount")
+    error: Optional[str] = None
+    retryable: bool = False
+    attempts: int = 0
+
+
+class BatchPublishResult(BaseModel):
+    """Merged result of a batch publish with resubmission of failed items."""
+
+    model_config = ConfigDict(populate_by_name=True)
+    results: List[BatchEventOutcome]
+    dead_letters: List[BatchEventOutcome] = Field(default_factory=list)
+    attempts: int = 0
+
+    @property
+    def queued_count(self) -> int:
+        return sum(1 for item in self.results if item.status == "queued")
+
+    @property
+    def failed_count(self) -> int:
+        return len(self.dead_letters)
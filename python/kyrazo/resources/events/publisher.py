@@ -0,0 +1,496 @@
+import logging
+import threading
+import time
+from collections import OrderedDict, deque
+from typing import Any, Callable, Deque, Dict, Hashable, List, Optional
+
+from ...core.exceptions import KyrazoError, RateLimitError
+from ...core.fork import register_after_fork
+from .models import BatchEventOutcome
+from .batching import AdaptiveBatchController
+from .coalescing import EventCoalescer
+from .template import EventBody, PreparedEvent, encode_event
+
+ErrorHandler = Callable[[Exception, List[EventBody]], None]
+DeadLetterHandler = Callable[[List[BatchEventOutcome]], None]
+
+logger = logging.getLogger(__name__)
+
+# Highest priority first
+PRIORITIES = ("urgent", "high", "normal", "low")
+DEFAULT_WEIGHTS = {"urgent": 8, "high": 4, "normal": 2, "low": 1}
+
+
+def event_priority(event: EventBody) -> str:
+    """Return the priority of an event, defaulting to "normal"."""
+    if isinstance(event, PreparedEvent):
+        return event.priority or "normal"
+    if event.meta is not None and event.meta.priority:
+        return event.meta.priority
+    return "normal"
+
+
+class _QueuedEvent:
+    __slots__ = ("event", "priority", "enqueued_at", "encoded")
+
+    def __init__(
+        self,
+        event: EventBody,
+        priority: str,
+        enqueued_at: float,
+        encoded: Optional[PreparedEvent] = None,
+    ):
+        self.event = event
+        self.priority = priority
+        self.enqueued_at = enqueued_at
+        # Set when batches are sized by bytes, so events are encoded only once
+        self.encoded = encoded
+
+
+class _StagedEvent:
+    __slots__ = ("event", "priority", "first_seen", "ready_at")
+
+    def __init__(
+        self, event: EventBody, priority: str, first_seen: float, ready_at: float
+    ):
+        self.event = event
+        self.priority = priority
+        self.first_seen = first_seen
+        self.ready_at = ready_at
+
+
+class _PriorityStats:
+    def __init__(self, window: int = 1000):
+        self.accepted = 0
+        self.sent = 0
+        self.shed = 0
+        self.failed = 0
+        self.total_queue_time = 0.0
+        self.max_queue_time = 0.0
+        self.queue_times: Deque[float] = deque(maxlen=window)
+
+    def observe_queue_time(self, seconds: float):
+        self.sent += 1
+        self.total_queue_time += seconds
+        self.max_queue_time = max(self.max_queue_time, seconds)
+        self.queue_times.append(seconds)
+
+    def as_dict(self, queued: int) -> Dict[str, float]:
+        ordered = sorted(self.queue_times)
+        p95 = ordered[int(0.95 * (len(ordered) - 1))] if ordered else 0.0
+        return {
+            "queued": queued,
+            "accepted": self.accepted,
+            "sent": self.sent,
+            "shed": self.shed,
+            "failed": self.failed,
+            "avg_queue_ms": (self.total_queue_time / self.sent * 1000)
+            if self.sent
+            else 0.0,
+            "p95_queue_ms": p95 * 1000,
+            "max_queue_ms": self.max_queue_time * 1000,
+        }
+
+
+class BufferedPublisher:
+    """
+    Buffers events and publishes them in batches from a background thread,
+    honouring `EventMeta.priority`.
+
+    Each priority has its own queue. Urgent events are sent without waiting
+    for the linger delay; other batches are filled by weighted fair draining
+    (deficit round-robin over `weights`) so low-priority traffic cannot be
+    starved. When `max_queue_size` events are buffered, the oldest event of
+    the lowest priority below the incoming one is shed; if there is none,
+    the incoming event is shed. On rate limiting the batch is put back and
+    sending pauses for `Retry-After`, after which the most urgent events go
+    first.
+
+    With a `coalescer`, events sharing a coalescing key are held in a
+    staging area for the coalescer's window and collapsed into one before
+    they are queued; an urgent event releases its key at once.
+
+    Args:
+        events: The `EventsClient` used to send batches.
+        project_id: The project ID events are published to.
+        max_batch_size: Maximum number of events per batch request.
+        linger: Seconds to wait for a batch to fill before sending it.
+        max_queue_size: Maximum number of buffered events across priorities.
+        weights: Relative drain weight per priority.
+        on_error: Called with the exception and the events of a failed batch.
+            Exceptions raised by `on_error` and `on_dead_letter` are logged.
+        max_attempts: When greater than 1, batches are sent with
+            `EventsClient.batch_with_retry` and only failed items are resubmitted.
+        on_dead_letter: Called with the outcomes of events that finally failed
+            when `max_attempts` is greater than 1.
+        batch_controller: Optional `AdaptiveBatchController` that sizes batches
+            by encoded bytes and observed latency, up to `max_batch_size`.
+        coalescer: Optional `EventCoalescer` collapsing redundant events.
+    """
+
+    def __init__(
+        self,
+        events,
+        project_id: str,
+        max_batch_size: int = 100,
+        linger: float = 0.05,
+        max_queue_size: int = 10000,
+        weights: Optional[Dict[str, int]] = None,
+        on_error: Optional[ErrorHandler] = None,
+        max_attempts: int = 1,
+        on_dead_letter: Optional[DeadLetterHandler] = None,
+        batch_controller: Optional[AdaptiveBatchController] = None,
+        coalescer: Optional[EventCoalescer] = None,
+    ):
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be at least 1")
+        weights = {**DEFAULT_WEIGHTS, **(weights or {})}
+        if any(weight <= 0 for weight in weights.values()):
+            raise ValueError("weights must be positive")
+
+        self._events = events
+        self.project_id = project_id
+        self.max_batch_size = max_batch_size
+        self.linger = linger
+        self.max_queue_size = max_queue_size
+        self.weights = weights
+        self.on_error = on_error
+        self.max_attempts = max_attempts
+        self.on_dead_letter = on_dead_letter
+        self.batch_controller = batch_controller
+        self.coalescer = coalescer
+
+        self._init_state()
+        register_after_fork(self, "_reset_after_fork")
+
+    def _init_state(self):
+        self._cond = threading.Condition()
+        self._queues: Dict[str, Deque[_QueuedEvent]] = {p: deque() for p in PRIORITIES}
+        self._deficits: Dict[str, float] = {p: 0.0 for p in PRIORITIES}
+        self._stats: Dict[str, _PriorityStats] = {
+            p: _PriorityStats() for p in PRIORITIES
+        }
+        self._size = 0
+        # Events held by the coalescer, by key, in arrival order
+        self._staged: "OrderedDict[Hashable, _StagedEvent]" = OrderedDict()
+        self._sending = False
+        self._flushing = 0
+        self._paused_until = 0.0
+        self._closed = False
+        self._worker: Optional[threading.Thread] = None
+
+    def _reset_after_fork(self):
+        # The worker thread does not exist in the child and events buffered
+        # by the parent belong to the parent, so start over empty
+        closed = self._closed
+        self._init_state()
+        self._closed = closed
+
+    def publish(self, event: EventBody) -> bool:
+        """
+        Buffer an event for publishing.
+
+        Returns False if the event was shed because the buffer is full.
+        """
+        priority = event_priority(event)
+        key = self.coalescer.key(event) if self.coalescer is not None else None
+        # Held events are encoded once they leave the staging area
+        encoded = self._encode(event, priority) if key is None else None
+        with self._cond:
+            if self._closed:
+                raise KyrazoError("Publisher has been closed", code="PUBLISHER_CLOSED")
+            self._ensure_worker()
+
+            stats = self._stats[priority]
+            if key is not None and key in self._staged:
+                self._merge_staged(key, event)
+                stats.accepted += 1
+                return True
+
+            if self._size + len(self._staged) >= self.max_queue_size and (
+                not self._shed_below(priority)
+            ):
+                stats.shed += 1
+                return False
+
+            now = time.monotonic()
+            if key is not None:
+                self.coalescer.hold()
+                ready_at = now if priority == "urgent" else now + self.coalescer.window
+                self._staged[key] = _StagedEvent(event, priority, now, ready_at)
+            else:
+                self._queues[priority].append(
+                    _QueuedEvent(event, priority, now, encoded)
+                )
+                self._size += 1
+            stats.accepted += 1
+            self._cond.notify_all()
+        return True
+
+    def _encode(self, event: EventBody, priority: str) -> Optional[PreparedEvent]:
+        if self.batch_controller is None:
+            return None
+        if isinstance(event, PreparedEvent):
+            return event
+        return PreparedEvent(event.event_type, encode_event(event), priority)
+
+    def _merge_staged(self, key: Hashable, event: EventBody):
+        staged = self._staged[key]
+        staged.event = self.coalescer.combine(staged.event, event)
+        staged.priority = event_priority(staged.event)
+        if event_priority(event) == "urgent":
+            staged.ready_at = time.monotonic()
+            self._cond.notify_all()
+
+    def _release_staged(self, now: float) -> Optional[float]:
+        """
+        Queue the held events whose window has passed (all of them when
+        flushing or closing). Returns seconds until the next release.
+        """
+        force = self._flushing or self._closed
+        next_release = None
+        for key, staged in list(self._staged.items()):
+            if force or staged.ready_at <= now:
+                del self._staged[key]
+                self.coalescer.emit()
+                self._queues[staged.priority].append(
+                    _QueuedEvent(
+                        staged.event,
+                        staged.priority,
+                        staged.first_seen,
+                        self._encode(staged.event, staged.priority),
+                    )
+                )
+                self._size += 1
+            elif next_release is None or staged.ready_at < now + next_release:
+                next_release = staged.ready_at - now
+        return next_release
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Send all buffered events now and wait until they have been sent.
+
+        Returns False if `timeout` elapsed first.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            self._flushing += 1
+            self._cond.notify_all()
+            try:
+                while self._size or self._staged or self._sending:
+                    if self._worker is None:
+                        break
+                    self._ensure_worker()
+                    remaining = (
+                        None if deadline is None else deadline - time.monotonic()
+                    )
+                    if remaining is not None and remaining <= 0:
+                        return False
+                    self._cond.wait(remaining)
+                return True
+            finally:
+                self._flushing -= 1
+
+    def close(self, timeout: Optional[float] = None):
+        """Flush buffered events and stop the background thread."""
+        self.flush(timeout)
+        with self._cond:
+            self._closed = True
+            worker = self._worker
+            self._cond.notify_all()
+        if worker is not None:
+            worker.join(timeout)
+
+    def metrics(self) -> Dict[str, Dict[str, float]]:
+        """Per-priority counters and queue times in milliseconds."""
+        with self._cond:
+            return {p: self._stats[p].as_dict(len(self._queues[p])) for p in PRIORITIES}
+
+    def _ensure_worker(self):
+        # A worker that died unexpectedly is replaced, so buffered events
+        # are not stranded
+        if self._worker is None or not self._worker.is_alive():
+            self._worker = threading.Thread(
+                target=self._run, name="kyrazo-publisher", daemon=True
+            )
+            self._worker.start()
+
+    def _shed_below(self, priority: str) -> bool:
+        # Evict the oldest event, queued or held by the coalescer, of the
+        # lowest priority below `priority`
+        for lower in reversed(PRIORITIES[PRIORITIES.index(priority) + 1 :]):
+            queue = self._queues[lower]
+            held = next(
+                (
+                    key
+                    for key, staged in self._staged.items()
+                    if staged.priority == lower
+                ),
+                None,
+            )
+            if held is not None and (
+                not queue or self._staged[held].first_seen < queue[0].enqueued_at
+            ):
+                del self._staged[held]
+                self.coalescer.drop()
+            elif queue:
+                queue.popleft()
+                self._size -= 1
+            else:
+                continue
+            self._stats[lower].shed += 1
+            return True
+        return False
+
+    def _ready_in(self, now: float) -> Optional[float]:
+        """Seconds until a batch should be sent, or None if idle."""
+        if not self._size:
+            return None
+        if now < self._paused_until:
+            return self._paused_until - now
+        if (
+            self._queues["urgent"]
+            or self._size >= self._batch_limit()
+            or self._flushing
+            or self._closed
+        ):
+            return 0.0
+        oldest = min(q[0].enqueued_at for q in self._queues.values() if q)
+        return max(0.0, oldest + self.linger - now)
+
+    def _batch_limit(self) -> int:
+        if self.batch_controller is None:
+            return self.max_batch_size
+        return min(self.max_batch_size, self.batch_controller.size)
+
+    def _fits(self, batch: List[_QueuedEvent], batch_bytes: int, queued: _QueuedEvent):
+        if not batch or self.batch_controller is None:
+            return True
+        return batch_bytes + len(queued.encoded) <= self.batch_controller.max_bytes
+
+    def _take_batch(self) -> List[_QueuedEvent]:
+        batch: List[_QueuedEvent] = []
+        batch_bytes = 0
+        limit = self._batch_limit()
+        full = False
+        while not full and len(batch) < limit and self._size:
+            for priority in PRIORITIES:
+                queue = self._queues[priority]
+                if not queue:
+                    self._deficits[priority] = 0.0
+                    continue
+                self._deficits[priority] += self.weights[priority]
+                while queue and self._deficits[priority] >= 1 and len(batch) < limit:
+                    if not self._fits(batch, batch_bytes, queue[0]):
+                        full = True
+                        break
+                    queued = queue.popleft()
+                    batch.append(queued)
+                    if queued.encoded is not None:
+                        batch_bytes += len(queued.encoded)
+                    self._deficits[priority] -= 1
+                    self._size -= 1
+                if full:
+                    break
+        return batch
+
+    def _requeue(self, batch: List[_QueuedEvent]):
+        for queued in reversed(batch):
+            self._queues[queued.priority].appendleft(queued)
+        self._size += len(batch)
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while True:
+                    now = time.monotonic()
+                    release_in = self._release_staged(now) if self._staged else None
+                    wait = self._ready_in(now)
+                    if release_in is not None:
+                        wait = release_in if wait is None else min(wait, release_in)
+                    if wait is None and self._closed:
+                        return
+                    if wait == 0:
+                        break
+                    self._cond.wait(wait)
+                batch = self._take_batch()
+                self._sending = True
+            try:
+                self._send(batch)
+            finally:
+                with self._cond:
+                    self._sending = False
+                    self._cond.notify_all()
+
+    def _send(self, batch: List[_QueuedEvent]):
+        sent_at = time.monotonic()
+        events = [queued.event for queued in batch]
+        payload = [queued.encoded or queued.event for queued in batch]
+        dead_letters: List[BatchEventOutcome] = []
+        retrying = self.max_attempts > 1
+        # With retries, each request is recorded by `batch_with_retry` itself
+        controller = None if retrying else self.batch_controller
+        try:
+            if retrying:
+                result = self._events.batch_with_retry(
+                    self.project_id,
+                    payload,
+                    max_attempts=self.max_attempts,
+                    batch_controller=self.batch_controller,
+                )
+                dead_letters = result.dead_letters
+                for item in dead_letters:
+                    item.event = events[item.index]
+                processing_time_ms = None
+            else:
+                response = self._events.batch(self.project_id, payload)
+                processing_time_ms = getattr(response, "processing_time_ms", None)
+        except RateLimitError as e:
+            if controller is not None:
+                controller.record(
+                    len(batch), time.monotonic() - sent_at, rate_limited=True
+                )
+            with self._cond:
+                self._requeue(batch)
+                retry_after = 1 if e.retry_after is None else e.retry_after
+                self._paused_until = time.monotonic() + retry_after
+            return
+        except Exception as e:
+            if controller is not None:
+                controller.record(len(batch), time.monotonic() - sent_at, error=True)
+            with self._cond:
+                for queued in batch:
+                    self._stats[queued.priority].failed += 1
+            if self.on_error is not None:
+                self._notify(self.on_error, e, events)
+            return
+
+        if controller is not None:
+            controller.record(
+                len(batch), time.monotonic() - sent_at, processing_time_ms
+            )
+        failed = {item.index for item in dead_letters}
+        with self._cond:
+            for index, queued in enumerate(batch):
+                if index in failed:
+                    self._stats[queued.priority].failed += 1
+                else:
+                    self._stats[queued.priority].observe_queue_time(
+                        sent_at - queued.enqueued_at
+                    )
+        if dead_letters and self.on_dead_letter is not None:
+            self._notify(self.on_dead_letter, dead_letters)
+
+    @staticmethod
+    def _notify(callback: Callable[..., None], *args: Any):
+        # A failing callback must not take down the worker thread
+        try:
+            callback(*args)
+        except Exception:
+            logger.exception("Publisher callback %r failed", callback)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
@@ -0,0 +1,116 @@
+import json
+from typing import Any, Dict, List, Optional, Union
+from .models import PublishEventBody, TargetInput, EventMeta
+
+EventPayload = Union[Dict[str, Any], bytes]
+
+
+def encode_json(value: Any) -> bytes:
+    """Encode a value as compact JSON bytes."""
+    return json.dumps(value, separators=(",", ":")).encode("utf-8")
+
+
+class PreparedEvent:
+    """
+    A fully encoded event body, ready to be sent as-is.
+
+    Instances are produced by `EventTemplate.prepare` and can be passed to
+    `EventsClient.publish` and `EventsClient.batch` in place of a
+    `PublishEventBody`.
+    """
+
+    __slots__ = ("event_type", "priority", "content")
+
+    def __init__(self, event_type: str, content: bytes, priority: Optional[str] = None):
+        self.event_type = event_type
+        self.priority = priority
+        self.content = content
+
+    def __len__(self) -> int:
+        return len(self.content)
+
+    def __repr__(self) -> str:
+        return f"PreparedEvent(event_type={self.event_type!r}, size={len(self)})"
+
+
+EventBody = Union[PublishEventBody, PreparedEvent]
+
+
+class EventTemplate:
+    """
+    Static parts of an event (webhook, targets and meta), validated and
+    encoded once.
+
+    Only the event type and payload are supplied per event. Payloads may be
+    dicts, or JSON object bytes which are spliced into the body without
+    being decoded.
+    """
+
+    def __init__(
+        self,
+        webhook_id: str,
+        targets: List[Union[TargetInput, Dict[str, Any]]],
+        meta: Optional[Union[EventMeta, Dict[str, Any]]] = None,
+    ):
+        # Validate the static fields through the regular model once
+        static = PublishEventBody(
+            webhook_id=webhook_id,
+            event_type="template",
+            payload={},
+            targets=targets,
+            meta=meta,
+        )
+        data = static.model_dump(by_alias=True, exclude_none=True)
+
+        self.webhook_id = static.webhook_id
+        self.priority = static.meta.priority if static.meta else None
+        self._prefix = b'{"webhookId":' + encode_json(data["webhookId"])
+        self._suffix = b',"targets":' + encode_json(data["targets"])
+        if "meta" in data:
+            self._suffix += b',"meta":' + encode_json(data["meta"])
+        self._suffix += b"}"
+
+    def prepare(self, event_type: str, payload: EventPayload) -> PreparedEvent:
+        """
+        Build a `PreparedEvent` from this template.
+
+        Args:
+            event_type: The event type.
+            payload: The event payload, as a dict or as encoded JSON object bytes.
+        """
+        if not event_type:
+            raise ValueError("event_type must be a non-empty string")
+
+        if isinstance(payload, (bytes, bytearray, memoryview)):
+            encoded = bytes(payload)
+            stripped = encoded.strip()
+            if not (stripped.startswith(b"{") and stripped.endswith(b"}")):
+                raise ValueError("payload bytes must be an encoded JSON object")
+        elif isinstance(payload, dict):
+            encoded = encode_json(payload)
+        else:
+            raise TypeError("payload must be a dict or JSON-encoded bytes")
+
+        content = b"".join(
+            (
+                self._prefix,
+                b',"eventType":',
+                encode_json(event_type),
+                b',"payload":',
+                encoded,
+                self._suffix,
+            )
+        )
+        return PreparedEvent(event_type, content, priority=self.priority)
+
+
+def encode_event(event: EventBody) -> bytes:
+    """Encode a single event body to JSON bytes."""
+    if isinstance(event, PreparedEvent):
+        return event.content
+    return encode_json(event.model_dump(by_alias=True, exclude_none=True))
+
+
+def encode_batch(events: List[EventBody]) -> bytes:
+    """Encode a list of events as a JSON array, splicing prepared events."""
+    return b"[" + b",".join(encode_event(evt) for evt in events) + b"]"
@@ -1,5 +1,6 @@
-from typing import List, Optional, Any
+from typing import List, Optional, Any, Iterator
 from ...core.http_client import HttpClient
+from ...core.deadline import Deadline
 from .models import Source, CreateSourceInput, UpdateSourceInput
 
 
@@ -7,28 +8,90 @@ class SourcesClient:
     def __init__(self, http_client: HttpClient):
         self._http_client = http_client
 
-    def list(self, project_id: str, params: Optional[dict] = None) -> Any:
+    def list(
+        self,
+        project_id: str,
+        params: Optional[dict] = None,
+        timeout: Optional[float] = None,
+        deadline: Optional[Deadline] = None,
+    ) -> Any:
         # Returns paginated response; simpler to return raw dict or generic model
-        return self._http_client.get(f"/v1/sources/{project_id}", params=params)
+        return self._http_client.get(
+            f"/v1/sources/{project_id}",
+            params=params,
+            timeout=timeout,
+            deadline=deadline,
+        )
+
+    def iter_all(
+        self,
+        project_id: str,
+        params: Optional[dict] = None,
+        timeout: Optional[float] = None,
+        deadline: Optional[Deadline] = None,
+    ) -> Iterator[Source]:
+        """Iterate over every source, fetching pages as needed."""
+        for item in self._http_client.paginate(
+            f"/v1/sources/{project_id}",
+            params=params,
+            timeout=timeout,
+            deadline=deadline,
+        ):
+            yield Source(**item)
 
-    def get(self, project_id: str, source_id: str) -> Source:
-        response = self._http_client.get(f"/v1/sources/{project_id}/{source_id}")
+    def get(
+        self,
+        project_id: str,
+        source_id: str,
+        timeout: Optional[float] = None,
+        deadline: Optional[Deadline] = None,
+    ) -> Source:
+        response = self._http_client.get(
+            f"/v1/sources/{project_id}/{source_id}", timeout=timeout, deadline=deadline
+        )
         return Source(**response.get("data"))
 
-    def create(self, project_id: str, data: CreateSourceInput) -> Source:
+    def create(
+        self,
+        project_id: str,
+        data: CreateSourceInput,
+        timeout: Optional[float] = None,
+        deadline: Optional[Deadline] = None,
+    ) -> Source:
         payload = data.model_dump(by_alias=True, exclude_none=True)
-        response = self._http_client.post(f"/v1/sources/{project_id}", data=payload)
+        response = self._http_client.post(
+            f"/v1/sources/{project_id}",
+            data=payload,
+            timeout=timeout,
+            deadline=deadline,
+        )
         return Source(**response.get("data"))
 
     def update(
-        self, project_id: str, source_id: str, data: UpdateSourceInput
+        self,
+        project_id: str,
+        source_id: str,
+        data: UpdateSourceInput,
+        timeout: Optional[float] = None,
+        deadline: Optional[Deadline] = None,
     ) -> Source:
         payload = data.model_dump(by_alias=True, exclude_none=True)
         response = self._http_client.patch(
-            f"/v1/sources/{project_id}/{source_id}", data=payload
+            f"/v1/sources/{project_id}/{source_id}",
+            data=payload,
+            timeout=timeout,
+            deadline=deadline,
         )
         return Source(**response.get("data"))
 
-    def delete(self, project_id: str, source_id: str) -> bool:
-        response = self._http_client.delete(f"/v1/sources/{project_id}/{source_id}")
+    def delete(
+        self,
+        project_id: str,
+        source_id: str,
+        timeout: Optional[float] = None,
+        deadline: Optional[Deadline] = None,
+    ) -> bool:
+        response = self._http_client.delete(
+            f"/v1/sources/{project_id}/{source_id}", timeout=timeout, deadline=deadline
+        )
         return response.get("success", False)
@@ -1,5 +1,6 @@
-from typing import List, Optional, Any
+from typing import List, Optional, Any, Iterator
 from ...core.http_client import HttpClient
+from ...core.deadline import Deadline
 from .models import Target, CreateTargetInput, UpdateTargetInput
 
 
@@ -7,38 +8,120 @@ class TargetsClient:
     def __init__(self, http_client: HttpClient):
         self._http_client = http_client
 
-    def list(self, project_id: str, params: Optional[dict] = None) -> Any:
-        return self._http_client.get(f"/v1/targets/{project_id}", params=params)
+    def list(
+        self,
+        project_id: str,
+        params: Optional[dict] = None,
+        timeout: Optional[float] = None,
+        deadline: Optional[Deadline] = None,
+    ) -> Any:
+        return self._http_client.get(
+            f"/v1/targets/{project_id}",
+            params=params,
+            timeout=timeout,
+            deadline=deadline,
+        )
+
+    def iter_all(
+        self,
+        project_id: str,
+        params: Optional[dict] = None,
+        timeout: Optional[float] = None,
+        deadline: Optional[Deadline] = None,
+    ) -> Iterator[Target]:
+        """Iterate over every target, fetching pages as needed."""
+        for item in self._http_client.paginate(
+            f"/v1/targets/{project_id}",
+            params=params,
+            timeout=timeout,
+            deadline=deadline,
+        ):
+            yield Target(**item)
 
-    def get(self, project_id: str, target_id: str) -> Target:
+    def get(
+        self,
+        project_id: str,
+        target_id: str,
+        timeout: Optional[float] = None,
+        deadline: Optional[Deadline] = None,
+    ) -> Target:
         # Note: Targets usually fetched via list or created, but assuming GET exists via ID
-        response = self._http_client.get(f"/v1/targets/{project_id}/{target_id}")
+        response = self._http_client.get(
+            f"/v1/targets/{project_id}/{target_id}", timeout=timeout, deadline=deadline
+        )
         return Target(**response.get("data"))
 
-    def create(self, project_id: str, data: CreateTargetInput) -> Target:
+    def create(
+        self,
+        project_id: str,
+        data: CreateTargetInput,
+        timeout: Optional[float] = None,
+        deadline: Optional[Deadline] = None,
+    ) -> Target:
         payload = data.model_dump(by_alias=True, exclude_none=True)
-        response = self._http_client.post(f"/v1/targets/{project_id}", data=payload)
+        response = self._http_client.post(
+            f"/v1/targets/{project_id}",
+            data=payload,
+            timeout=timeout,
+            deadline=deadline,
+        )
         return Target(**response.get("data"))
 
     def update(
-        self, project_id: str, target_id: str, data: UpdateTargetInput
+        self,
+        project_id: str,
+        target_id: str,
+        data: UpdateTargetInput,
+        timeout: Optional[float] = None,
+        deadline: Optional[Deadline] = None,
     ) -> Target:
         payload = data.model_dump(by_alias=True, exclude_none=True)
         response = self._http_client.patch(
-            f"/v1/targets/{project_id}/{target_id}", data=payload
+            f"/v1/targets/{project_id}/{target_id}",
+            data=payload,
+            timeout=timeout,
+            deadline=deadline,
         )
         return Target(**response.get("data"))
 
-    def delete(self, project_id: str, target_id: str) -> bool:
-        response = self._http_client.delete(f"/v1/targets/{project_id}/{target_id}")
+    def delete(
+        self,
+        project_id: str,
+        target_id: str,
+        timeout: Optional[float] = None,
+        deadline: Optional[Deadline] = None,
+    ) -> bool:
+        response = self._http_client.delete(
+            f"/v1/targets/{project_id}/{target_id}", timeout=timeout, deadline=deadline
+        )
         return response.get("success", False)
 
-    def get_secret(self, project_id: str, target_id: str) -> str:
-        response = self._http_client.get(f"/v1/targets/{project_id}/{target_id}/secret")
+    def get_secret(
+        self,
+        project_id: str,
+        target_id: str,
+        timeout: Optional[float] = None,
+        deadline: Optional[Deadline] = None,
+    ) -> str:
+        response = self._http_client.get(
+            f"/v1/targets/{project_id}/{target_id}/secret",
+            timeout=timeout,
+            deadline=deadline,
+        )
         return response.get("data", {}).get("secret")
 
-    def update_status(self, project_id: str, target_id: str, enabled: bool) -> Target:
+    def update_status(
+        self,
+        project_id: str,
+        target_id: str,
+        enabled: bool,
+        timeout: Optional[float] = None,
+        deadline: Optional[Deadline] = None,
+    ) -> Target:
         response = self._http_client.put(
-            f"/v1/targets/{project_id}/{target_id}", data={"enabled": enabled}
+            f"/v1/targets/{project_id}/{target_id}",
+            data={"enabled": enabled},
+            timeout=timeout,
+            deadline=deadline,
         )
         return Target(**response.get("data"))
@@ -1,6 +1,14 @@
+import json
+import httpx
 import pytest
 from httpx import Response
-from kyrazo.resources.events import PublishEventBody, TargetInput
+from pydantic import ValidationError as PydanticValidationError
+from kyrazo.resources.events import (
+    AdaptiveBatchController,
+    EventTemplate,
+    PublishEventBody,
+    TargetInput,
+)
 
 
 def test_publish_event_success(client, mock_api):
@@ -61,3 +69,210 @@ def test_publish_event_idempotency(client, mock_api):
     client.events.publish(project_id, event_body, idempotency_key=key)
 
     assert route.calls.last.request.headers["Idempotency-Key"] == key
+
+
+def test_publish_prepared_event_splices_raw_payload(client, mock_api):
+    project_id = "proj_123"
+    route = mock_api.post(f"/v1/events/{project_id}/publish").mock(
+        return_value=Response(
+            200,
+            json={
+                "status": "queued",
+                "eventId": "evt_123",
+                "targetsCount": 1,
+                "unfoundTargets": [],
+                "queuedAt": "now",
+                "processingTimeMs": 1,
+            },
+        )
+    )
+
+    template = client.events.template(
+        webhook_id="wh_123",
+        targets=[{"targetId": "tgt_1"}],
+        meta={"priority": "high"},
+    )
+    prepared = template.prepare("stock.updated", b'{"sku": "A-1", "qty": 3}')
+    response = client.events.publish(project_id, prepared)
+
+    assert response.event_id == "evt_123"
+    assert json.loads(route.calls.last.request.content) == {
+        "webhookId": "wh_123",
+        "eventType": "stock.updated",
+        "payload": {"sku": "A-1", "qty": 3},
+        "targets": [{"targetId": "tgt_1"}],
+        "meta": {"priority": "high"},
+    }
+
+
+def test_batch_mixes_prepared_and_model_events(client, mock_api):
+    project_id = "proj_123"
+    route = mock_api.post(f"/v1/events/{project_id}/publish/batch").mock(
+        return_value=Response(
+            200,
+            json={
+                "status": "queued",
+                "batchSize": 2,
+                "queuedCount": 2,
+                "skippedCount": 0,
+                "failedCount": 0,
+                "results": [
+                    {"eventId": "evt_1", "status": "queued"},
+                    {"eventId": "evt_2", "status": "queued"},
+                ],
+                "queuedAt": "now",
+                "processingTimeMs": 1,
+            },
+        )
+    )
+
+    template = client.events.template(
+        webhook_id="wh_123", targets=[{"targetId": "tgt_1"}]
+    )
+    model = PublishEventBody(
+        webhook_id="wh_123",
+        event_type="user.created",
+        payload={"id": 1},
+        targets=[TargetInput(target_id="tgt_1")],
+    )
+    response = client.events.batch(
+        project_id, [template.prepare("user.updated", {"id": 2}), model]
+    )
+
+    assert response.queued_count == 2
+    sent = json.loads(route.calls.last.request.content)
+    assert [evt["eventType"] for evt in sent] == ["user.updated", "user.created"]
+    assert sent[0]["payload"] == {"id": 2}
+
+
+def test_template_validates_static_fields_and_payload():
+    with pytest.raises(PydanticValidationError):
+        EventTemplate(webhook_id="wh_123", targets=[])
+
+    template = EventTemplate(webhook_id="wh_123", targets=[{"targetId": "tgt_1"}])
+    with pytest.raises(ValueError):
+        template.prepare("user.created", b"[1, 2]")
+
+
+def batch_response(results):
+    failed = sum(1 for item in results if item["status"] == "failed")
+    return Response(
+        200,
+        json={
+            "status": "partial" if failed else "queued",
+            "batchSize": len(results),
+            "queuedCount": len(results) - failed,
+            "skippedCount": 0,
+            "failedCount": failed,
+            "results": results,
+            "queuedAt": "now",
+            "processingTimeMs": 1,
+        },
+    )
+
+
+def test_batch_with_retry_resubmits_only_retryable_failures(client, mock_api):
+    project_id = "proj_123"
+    route = mock_api.post(f"/v1/events/{project_id}/publish/batch").mock(
+        side_effect=[
+            batch_response(
+                [
+                    {"eventId": "evt_1", "status": "queued"},
+                    {"eventId": "evt_2", "status": "failed", "error": "Timeout"},
+                    {"eventId": "evt_3", "status": "failed", "error": "Bad payload"},
+                ]
+            ),
+            batch_response([{"eventId": "evt_2b", "status": "queued"}]),
+        ]
+    )
+    events = [
+        PublishEventBody(
+            webhook_id="wh_123",
+            event_type="user.created",
+            payload={"n": n},
+            targets=[TargetInput(target_id="tgt_1")],
+        )
+        for n in range(3)
+    ]
+
+    result = client.events.batch_with_retry(
+        project_id, events, idempotency_key="key", backoff=0
+    )
+
+    assert route.call_count == 2
+    resent = json.loads(route.calls.last.request.content)
+    assert [evt["payload"] for evt in resent] == [{"n": 1}]
+    assert route.calls.last.request.headers["Idempotency-Key"] == "key-2-0"
+
+    assert [item.status for item in result.results] == ["queued", "queued", "failed"]
+    assert result.results[1].event_id == "evt_2b"
+    assert result.results[1].attempts == 2
+    assert [item.index for item in result.dead_letters] == [2]
+    assert result.dead_letters[0].event is events[2]
+
+
+def test_batch_with_retry_retries_server_errors(client, mock_api):
+    project_id = "proj_123"
+    mock_api.post(f"/v1/events/{project_id}/publish/batch").mock(
+        side_effect=[
+            Response(503, json={"error": {"message": "Unavailable"}}),
+            batch_response([{"eventId": "evt_1", "status": "queued"}]),
+        ]
+    )
+    template = EventTemplate(webhook_id="wh_123", targets=[{"targetId": "tgt_1"}])
+
+    result = client.events.batch_with_retry(
+        project_id, [template.prepare("user.created", {"n": 1})], backoff=0
+    )
+
+    assert result.queued_count == 1
+    assert result.dead_letters == []
+
+
+def test_batch_with_retry_resends_timed_out_chunk_with_same_key(client, mock_api):
+    project_id = "proj_123"
+    route = mock_api.post(f"/v1/events/{project_id}/publish/batch").mock(
+        side_effect=[
+            httpx.ReadTimeout("timed out"),
+            batch_response([{"eventId": "evt_1", "status": "queued"}]),
+        ]
+    )
+    template = EventTemplate(webhook_id="wh_123", targets=[{"targetId": "tgt_1"}])
+
+    result = client.events.batch_with_retry(
+        project_id,
+        [template.prepare("user.created", {"n": 1})],
+        idempotency_key="key",
+        backoff=0,
+    )
+
+    keys = [call.request.headers["Idempotency-Key"] for call in route.calls]
+    assert keys == ["key-1-0", "key-1-0"]
+    assert result.queued_count == 1
+    assert result.results[0].attempts == 2
+
+
+def test_batch_with_retry_feeds_each_request_to_controller(client, mock_api):
+    project_id = "proj_123"
+    mock_api.post(f"/v1/events/{project_id}/publish/batch").mock(
+        side_effect=[
+            Response(429, headers={"Retry-After": "0"}),
+            batch_response([{"eventId": "evt_1", "status": "queued"}]),
+        ]
+    )
+    template = EventTemplate(webhook_id="wh_123", targets=[{"targetId": "tgt_1"}])
+    controller = AdaptiveBatchController(initial_size=4, target_latency=0.2)
+
+    client.events.batch_with_retry(
+        project_id,
+        [template.prepare("user.created", {"n": 1})],
+        backoff=0.3,
+        batch_controller=controller,
+    )
+
+    metrics = controller.metrics()
+    assert metrics["batches"] == 2
+    assert metrics["errors"] == 1
+    assert metrics["size"] == 2
+    # The backoff sleep is not part of the recorded round trip
+    assert metrics["last_latency_ms"] < 200
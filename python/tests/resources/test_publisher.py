@@ -0,0 +1,237 @@
+import threading
+import time
+import pytest
+from kyrazo import RateLimitError
+from kyrazo.resources.events import (
+    AdaptiveBatchController,
+    BufferedPublisher,
+    EventCoalescer,
+    PublishEventBody,
+)
+
+
+def make_event(priority, n=0):
+    return PublishEventBody(
+        webhook_id="wh_123",
+        event_type=f"{priority}.event",
+        payload={"n": n},
+        targets=[{"targetId": "tgt_1"}],
+        meta={"priority": priority},
+    )
+
+
+class FakeEvents:
+    """Records batches; the first batch blocks until released."""
+
+    def __init__(self, block_first=False, fail_with=None):
+        self.batches = []
+        self.sent = []
+        self.release = threading.Event()
+        self.started = threading.Event()
+        self.block_first = block_first
+        self.fail_with = fail_with
+
+    def batch(self, project_id, events):
+        if self.block_first and not self.batches:
+            self.started.set()
+            self.release.wait(5)
+        if self.fail_with is not None:
+            error, self.fail_with = self.fail_with, None
+            raise error
+        self.batches.append([evt.event_type for evt in events])
+        self.sent.extend(events)
+
+
+def test_urgent_events_bypass_linger():
+    events = FakeEvents()
+    publisher = BufferedPublisher(events, "proj_123", linger=60)
+
+    publisher.publish(make_event("urgent"))
+    publisher.publish(make_event("low"))
+    assert publisher.flush(timeout=5)
+
+    assert events.batches[0][0] == "urgent.event"
+    publisher.close()
+
+
+def test_weighted_fair_draining():
+    events = FakeEvents(block_first=True)
+    publisher = BufferedPublisher(events, "proj_123", max_batch_size=10, linger=0)
+
+    publisher.publish(make_event("normal"))
+    events.started.wait(5)
+    for n in range(20):
+        publisher.publish(make_event("low", n))
+        publisher.publish(make_event("high", n))
+    events.release.set()
+    publisher.close(timeout=5)
+
+    second = events.batches[1]
+    assert second.count("high.event") == 8
+    assert second.count("low.event") == 2
+
+
+def test_low_priority_events_are_shed_first():
+    events = FakeEvents(block_first=True)
+    publisher = BufferedPublisher(events, "proj_123", max_queue_size=2, linger=0)
+
+    publisher.publish(make_event("normal"))
+    events.started.wait(5)
+    assert publisher.publish(make_event("low", 1))
+    assert publisher.publish(make_event("low", 2))
+    assert publisher.publish(make_event("high"))
+    assert not publisher.publish(make_event("low", 3))
+    events.release.set()
+    publisher.close(timeout=5)
+
+    metrics = publisher.metrics()
+    assert metrics["low"]["shed"] == 2
+    assert metrics["high"]["sent"] == 1
+    assert events.batches[1] == ["high.event", "low.event"]
+
+
+def test_rate_limited_batch_is_requeued():
+    events = FakeEvents(fail_with=RateLimitError("slow down", retry_after=0))
+    publisher = BufferedPublisher(events, "proj_123", linger=0)
+
+    publisher.publish(make_event("normal"))
+    publisher.close(timeout=5)
+
+    assert events.batches == [["normal.event"]]
+    assert publisher.metrics()["normal"]["sent"] == 1
+
+
+def test_failing_error_callback_does_not_stop_worker():
+    def on_error(error, events):
+        raise RuntimeError("callback bug")
+
+    events = FakeEvents(fail_with=ValueError("bad batch"))
+    publisher = BufferedPublisher(events, "proj_123", linger=0, on_error=on_error)
+
+    publisher.publish(make_event("normal", 1))
+    assert publisher.flush(timeout=2)
+    publisher.publish(make_event("normal", 2))
+    assert publisher.flush(timeout=2)
+
+    assert publisher._worker.is_alive()
+    assert events.batches == [["normal.event"]]
+    publisher.close(timeout=5)
+
+
+def test_non_positive_weights_are_rejected():
+    with pytest.raises(ValueError):
+        BufferedPublisher(FakeEvents(), "proj_123", weights={"low": 0})
+
+
+def test_adaptive_controller_aimd():
+    controller = AdaptiveBatchController(
+        initial_size=10, increase=5, target_latency=0.2
+    )
+
+    controller.record(10, latency=0.05, processing_time_ms=20)
+    assert controller.size == 15
+    controller.record(3, latency=0.05)
+    assert controller.size == 15
+    controller.record(15, latency=0.5)
+    assert controller.size == 7
+    controller.record(7, latency=0.05, rate_limited=True)
+    assert controller.size == 3
+
+    metrics = controller.metrics()
+    assert [size for _, size in metrics["history"]] == [10, 15, 7, 3]
+    assert metrics["errors"] == 1
+
+
+def test_publisher_splits_batches_by_encoded_size():
+    events = FakeEvents()
+    event_size = len(make_event("normal").model_dump_json(by_alias=True))
+    controller = AdaptiveBatchController(max_bytes=event_size * 2 + 10)
+    publisher = BufferedPublisher(
+        events, "proj_123", linger=60, batch_controller=controller
+    )
+
+    for n in range(5):
+        publisher.publish(make_event("normal", n))
+    publisher.close(timeout=5)
+
+    assert [len(batch) for batch in events.batches] == [2, 2, 1]
+
+
+def stock_update(sku, qty, priority="normal"):
+    return PublishEventBody(
+        webhook_id="wh_123",
+        event_type="stock.updated",
+        payload={"sku": sku, "qty": qty},
+        targets=[{"targetId": "tgt_1"}],
+        meta={"priority": priority},
+    )
+
+
+def test_coalescing_keeps_latest_event_per_key():
+    events = FakeEvents()
+    coalescer = EventCoalescer(key=lambda payload: payload.get("sku"), window=60)
+    publisher = BufferedPublisher(events, "proj_123", coalescer=coalescer)
+
+    for qty in range(50):
+        publisher.publish(stock_update("sku_a", qty))
+    for qty in range(30):
+        publisher.publish(stock_update("sku_b", qty))
+    publisher.publish(make_event("normal"))
+    publisher.close(timeout=5)
+
+    sent = {evt.payload.get("sku"): evt.payload for evt in events.sent}
+    assert len(events.sent) == 3
+    assert sent["sku_a"]["qty"] == 49
+    assert sent["sku_b"]["qty"] == 29
+    metrics = coalescer.metrics()
+    assert metrics["received"] == 80
+    assert metrics["emitted"] == 2
+    assert metrics["collapse_ratio"] == 78 / 80
+
+
+def test_coalescing_merges_and_releases_after_window():
+    def merge(previous, latest):
+        payload = {
+            **latest.payload,
+            "qty": previous.payload["qty"] + latest.payload["qty"],
+        }
+        return latest.model_copy(update={"payload": payload})
+
+    events = FakeEvents()
+    coalescer = EventCoalescer(key=lambda p: p["sku"], window=0.05, merge=merge)
+    publisher = BufferedPublisher(events, "proj_123", linger=0.01, coalescer=coalescer)
+
+    for _ in range(5):
+        publisher.publish(stock_update("sku_a", 2))
+    for _ in range(100):
+        if events.sent:
+            break
+        time.sleep(0.01)
+
+    assert [evt.payload for evt in events.sent] == [{"sku": "sku_a", "qty": 10}]
+    publisher.close(timeout=5)
+
+
+def test_held_low_priority_events_are_shed_first():
+    events = FakeEvents()
+    coalescer = EventCoalescer(key=lambda payload: payload.get("sku"), window=60)
+    publisher = BufferedPublisher(
+        events, "proj_123", max_queue_size=2, linger=60, coalescer=coalescer
+    )
+
+    for sku in ("sku_a", "sku_b"):
+        assert publisher.publish(stock_update(sku, 1, "low"))
+    assert publisher.publish(make_event("high"))
+    publisher.close(timeout=5)
+
+    assert sorted(evt.event_type for evt in events.sent) == [
+        "high.event",
+        "stock.updated",
+    ]
+    assert [evt.payload["sku"] for evt in events.sent if evt.payload.get("sku")] == [
+        "sku_b"
+    ]
+    assert publisher.metrics()["low"]["shed"] == 1
+    metrics = coalescer.metrics()
+    assert (metrics["received"], metrics["emitted"], metrics["dropped"]) == (2, 1, 1)
+    assert metrics["collapse_ratio"] == 0
@@ -0,0 +1,48 @@
+import socket
+import pytest
+from kyrazo import Kyrazo, NetworkError
+from kyrazo.core.connection import DNSCache
+from kyrazo.replay import StandInServer
+
+
+def test_warmup_opens_pooled_connections():
+    with StandInServer(latency=0.05) as server:
+        with Kyrazo(api_key="key", base_url=server.url) as client:
+            opened = client.warmup(connections=3)
+            client._http_client.get("/v1/test")
+
+            assert opened == 3
+            assert client.stats["connections"] == 3
+            assert client.timings["connect"]["count"] == 3
+
+
+def test_warm_on_init_does_not_raise_when_unreachable():
+    sock = socket.socket()
+    sock.bind(("127.0.0.1", 0))
+    port = sock.getsockname()[1]
+    sock.close()
+
+    with Kyrazo(
+        api_key="key", base_url=f"http://127.0.0.1:{port}", warm_on_init=True
+    ) as client:
+        with pytest.raises(NetworkError):
+            client.warmup(connections=1)
+
+
+def test_dns_cache_reuses_lookups_until_expiry(monkeypatch):
+    calls = []
+
+    def getaddrinfo(host, port, *args, **kwargs):
+        calls.append(host)
+        return [(socket.AF_INET, socket.SOCK_STREAM, 6, "", ("10.0.0.1", port))]
+
+    monkeypatch.setattr(socket, "getaddrinfo", getaddrinfo)
+
+    cache = DNSCache(ttl=60)
+    assert cache.resolve("api.kyrazo.com", 443) == ["10.0.0.1"]
+    assert cache.resolve("api.kyrazo.com", 443) == ["10.0.0.1"]
+    assert len(calls) == 1
+
+    cache.invalidate("api.kyrazo.com", 443)
+    cache.resolve("api.kyrazo.com", 443)
+    assert len(calls) == 2
@@ -0,0 +1,91 @@
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import httpx
+import pytest
+from httpx import Response
+from kyrazo import Deadline, DeadlineExceededError, Kyrazo, RequestCancelledError
+
+
+def test_per_call_timeout_is_sent_to_transport(client, mock_api):
+    route = mock_api.get("/v1/targets/proj_123/tgt_123/secret").mock(
+        return_value=Response(200, json={"data": {"secret": "s"}})
+    )
+
+    client.targets.get_secret("proj_123", "tgt_123", timeout=0.15)
+
+    timeout = route.calls.last.request.extensions["timeout"]
+    assert 0 < timeout["read"] <= 0.15
+
+
+def test_timeout_maps_to_deadline_exceeded(client, mock_api):
+    mock_api.get("/v1/targets/proj_123/tgt_123/secret").mock(
+        side_effect=httpx.ReadTimeout("timed out")
+    )
+
+    with pytest.raises(DeadlineExceededError):
+        client.targets.get_secret("proj_123", "tgt_123", timeout=0.15)
+
+
+def test_cancelled_deadline_does_not_send(client, mock_api):
+    # No route is mocked: sending anything would fail the test
+    deadline = Deadline(5)
+    child = deadline.child(1)
+    deadline.cancel()
+
+    assert child.cancelled
+    with pytest.raises(RequestCancelledError):
+        client.targets.delete("proj_123", "tgt_123", deadline=child)
+
+
+def test_deadline_spans_pagination(client, mock_api, monkeypatch):
+    deadline = Deadline(10)
+
+    def first_page(request):
+        # Simulate the budget running out while the first page was processed
+        monkeypatch.setattr(deadline, "_expires_at", 0)
+        return Response(
+            200, json={"data": [{"_id": "src_1"}], "pagination": {"pages": 2}}
+        )
+
+    mock_api.get("/v1/sources/proj_123", params={"page": "1"}).mock(
+        side_effect=first_page
+    )
+
+    with pytest.raises(DeadlineExceededError):
+        list(client._http_client.paginate("/v1/sources/proj_123", deadline=deadline))
+
+
+class TricklingHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", "20")
+        self.end_headers()
+        try:
+            for byte in b'{"data": "trickled"}':
+                self.wfile.write(bytes([byte]))
+                self.wfile.flush()
+                time.sleep(0.1)
+        except OSError:
+            pass
+
+    def log_message(self, *args):
+        pass
+
+
+def test_deadline_bounds_trickling_response():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), TricklingHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    try:
+        with Kyrazo(api_key="key", base_url=base_url) as client:
+            started = time.monotonic()
+            with pytest.raises(DeadlineExceededError):
+                client._http_client.get("/v1/slow", timeout=0.15)
+
+            assert time.monotonic() - started < 0.5
+    finally:
+        server.shutdown()
+        server.server_close()
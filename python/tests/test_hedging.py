@@ -0,0 +1,111 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from httpx import Response
+from kyrazo import Kyrazo, HedgePolicy
+
+
+@pytest.fixture
+def hedged_client(api_key, base_url):
+    policy = HedgePolicy(min_delay=0.01, max_delay=0.05)
+    with Kyrazo(api_key=api_key, base_url=base_url, hedge=policy) as client:
+        yield client
+
+
+def slow_first_call():
+    calls = []
+    lock = threading.Lock()
+
+    def handler(request):
+        with lock:
+            calls.append(request)
+            first = len(calls) == 1
+        if first:
+            time.sleep(0.5)
+        return Response(200, json={"data": {"secret": "slow" if first else "fast"}})
+
+    return handler, calls
+
+
+def test_slow_get_is_hedged(hedged_client, mock_api):
+    handler, calls = slow_first_call()
+    mock_api.get("/v1/targets/proj_123/tgt_123/secret").mock(side_effect=handler)
+
+    secret = hedged_client.targets.get_secret("proj_123", "tgt_123")
+
+    assert secret == "fast"
+    assert len(calls) == 2
+    assert hedged_client.stats["hedges"] == 1
+    assert hedged_client.stats["hedge_wins"] == 1
+
+
+def test_post_without_idempotency_key_is_not_hedged(hedged_client, mock_api):
+    handler, calls = slow_first_call()
+    mock_api.post("/v1/targets/proj_123").mock(side_effect=handler)
+
+    hedged_client._http_client.post("/v1/targets/proj_123", data={})
+
+    assert len(calls) == 1
+    assert "hedges" not in hedged_client.stats
+
+
+def test_hedge_budget_caps_hedges():
+    policy = HedgePolicy(max_hedge_ratio=0.25, burst=1)
+
+    assert policy.try_acquire()
+    assert not policy.try_acquire()
+    for _ in range(4):
+        policy.on_request()
+    assert policy.try_acquire()
+
+
+class SlowServer(ThreadingHTTPServer):
+    request_queue_size = 128
+    daemon_threads = True
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), SlowHandler)
+        self.lock = threading.Lock()
+        self.active = 0
+        self.peak = 0
+
+
+class SlowHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        server = self.server
+        with server.lock:
+            server.active += 1
+            server.peak = max(server.peak, server.active)
+        time.sleep(0.2)
+        with server.lock:
+            server.active -= 1
+        body = b'{"data": {}}'
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def test_hedging_does_not_cap_concurrency(api_key):
+    server = SlowServer()
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    try:
+        policy = HedgePolicy(max_delay=5.0)
+        with Kyrazo(api_key=api_key, base_url=base_url, hedge=policy) as client:
+            with ThreadPoolExecutor(max_workers=48) as callers:
+                list(callers.map(lambda _: client._http_client.get("/"), range(48)))
+
+        assert server.peak > 32
+    finally:
+        server.shutdown()
+        server.server_close()
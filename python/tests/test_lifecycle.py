@@ -0,0 +1,64 @@
+import gc
+import os
+import threading
+import pytest
+from kyrazo import Kyrazo, ClientProvider, KyrazoError
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="requires os.fork")
+def test_pool_is_rebuilt_in_forked_child():
+    client = Kyrazo(api_key="test")
+    parent_pool = client._http_client._get_client()
+
+    pid = os.fork()
+    if pid == 0:
+        child_pool = client._http_client._get_client()
+        os._exit(0 if child_pool is not parent_pool else 1)
+
+    _, status = os.waitpid(pid, 0)
+    assert os.WEXITSTATUS(status) == 0
+    assert client._http_client._get_client() is parent_pool
+    client.close()
+
+
+def test_closed_client_rejects_requests():
+    client = Kyrazo(api_key="test")
+    client._http_client._get_client()
+    client.close()
+
+    with pytest.raises(KyrazoError) as error:
+        client.targets.get_secret("proj_123", "tgt_123")
+    assert error.value.code == "CLIENT_CLOSED"
+
+
+def test_thread_scoped_provider():
+    with ClientProvider(scope="thread", api_key="test") as provider:
+        seen = []
+        thread = threading.Thread(target=lambda: seen.append(provider.get()))
+        thread.start()
+        thread.join()
+
+        assert provider.get() is provider.get()
+        assert seen[0] is not provider.get()
+
+
+def test_thread_client_is_closed_when_thread_exits():
+    with ClientProvider(scope="thread", api_key="test") as provider:
+        seen = []
+        thread = threading.Thread(target=lambda: seen.append(provider.get()))
+        thread.start()
+        thread.join()
+        gc.collect()
+
+        assert seen[0]._http_client._closed
+        assert len(provider._thread_clients) == 0
+
+
+def test_process_scoped_provider_shares_client_across_threads():
+    with ClientProvider(api_key="test") as provider:
+        seen = []
+        thread = threading.Thread(target=lambda: seen.append(provider.get()))
+        thread.start()
+        thread.join()
+
+        assert seen[0] is provider.get()
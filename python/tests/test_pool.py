@@ -0,0 +1,52 @@
+from httpx import Response
+from kyrazo import KyrazoPool
+
+
+def test_tenants_share_pool_with_own_credentials(base_url, mock_api):
+    route = mock_api.get("/v1/targets/proj_123/tgt_123/secret").mock(
+        return_value=Response(200, json={"data": {"secret": "s"}})
+    )
+
+    with KyrazoPool(base_url=base_url) as pool:
+        first, second = pool.get("key_a"), pool.get("key_b")
+        first.targets.get_secret("proj_123", "tgt_123")
+        second.targets.get_secret("proj_123", "tgt_123")
+
+        assert pool.get("key_a") is first
+        assert first._http_client._get_client() is second._http_client._get_client()
+
+    auth = [call.request.headers["Authorization"] for call in route.calls]
+    assert auth == ["Bearer key_a", "Bearer key_b"]
+
+
+def test_least_recently_used_tenants_are_evicted():
+    with KyrazoPool(max_tenants=2) as pool:
+        first = pool.get("key_a")
+        pool.get("key_b")
+        pool.get("key_a")
+        pool.get("key_c")
+
+        assert pool.stats == {
+            "tenants": 2,
+            "tenants_created": 3,
+            "tenants_evicted": 1,
+        }
+        assert pool.get("key_a") is first
+
+
+def test_idle_tenants_are_evicted():
+    with KyrazoPool(idle_timeout=0) as pool:
+        first = pool.get("key_a")
+
+        assert pool.get("key_a") is not first
+        assert pool.stats["tenants_evicted"] >= 1
+
+
+def test_closing_a_facade_keeps_the_shared_pool_open():
+    with KyrazoPool() as pool:
+        facade = pool.get("key_a")
+        shared = facade._http_client._get_client()
+        facade.close()
+
+        assert not shared.is_closed
+        assert pool.get("key_a") is not facade
@@ -0,0 +1,122 @@
+import asyncio
+import hashlib
+import hmac
+import json
+import time
+import httpx
+import pytest
+from kyrazo.receiver import WebhookReceiver
+from kyrazo.resources.sources.models import SourceAuthentication
+
+
+def receiver_client(receiver):
+    transport = httpx.ASGITransport(app=receiver)
+    return httpx.AsyncClient(transport=transport, base_url="http://receiver")
+
+
+async def test_events_are_acknowledged_deduplicated_and_dispatched():
+    receiver = WebhookReceiver()
+    handled = []
+
+    @receiver.on("user.created")
+    async def on_user_created(event):
+        handled.append(event["id"])
+
+    async with receiver_client(receiver) as client:
+        event = {"id": "evt_1", "eventType": "user.created", "payload": {}}
+        first = await client.post("/", json=event)
+        second = await client.post("/", json=event)
+        await receiver.drain()
+
+    assert first.status_code == 202
+    assert second.status_code == 200
+    assert handled == ["evt_1"]
+    assert receiver.metrics()["duplicates"] == 1
+    await receiver.close()
+
+
+async def test_full_queue_is_refused_with_retry_after():
+    receiver = WebhookReceiver(workers=1, queue_size=1)
+    release = asyncio.Event()
+
+    @receiver.on("*")
+    async def slow(event):
+        await release.wait()
+
+    async with receiver_client(receiver) as client:
+        statuses = []
+        for i in range(3):
+            response = await client.post("/", json={"id": f"evt_{i}", "type": "x"})
+            statuses.append(response.status_code)
+            await asyncio.sleep(0)
+
+        assert statuses == [202, 202, 503]
+        assert response.headers["retry-after"] == "1"
+        release.set()
+        await receiver.close()
+
+
+async def test_failing_error_callback_does_not_stop_workers():
+    def on_error(error, event):
+        raise RuntimeError("callback bug")
+
+    receiver = WebhookReceiver(workers=2, on_error=on_error)
+    handled = []
+
+    @receiver.on("*")
+    async def handle(event):
+        if event["id"] != "evt_ok":
+            raise ValueError("handler bug")
+        handled.append(event["id"])
+
+    async with receiver_client(receiver) as client:
+        for event_id in ("evt_1", "evt_2", "evt_3", "evt_ok"):
+            await client.post("/", json={"id": event_id, "type": "x"})
+        await asyncio.wait_for(receiver.drain(), timeout=2)
+
+    assert handled == ["evt_ok"]
+    assert receiver.metrics()["failed"] == 3
+    await asyncio.wait_for(receiver.close(), timeout=2)
+
+
+async def test_api_key_authentication():
+    auth = SourceAuthentication(
+        enabled=True,
+        type="api_key",
+        apiKey={"headerKey": "X-Source-Key", "apiKey": "secret"},
+    )
+    receiver = WebhookReceiver(authentication=auth)
+
+    async with receiver_client(receiver) as client:
+        denied = await client.post("/", json={"id": "evt_1"})
+        allowed = await client.post(
+            "/", json={"id": "evt_1"}, headers={"X-Source-Key": "secret"}
+        )
+
+    assert denied.status_code == 401
+    assert allowed.status_code == 202
+
+
+def test_stripe_signature_authentication():
+    auth = SourceAuthentication(
+        enabled=True, type="service", service={"secret": "whsec_test"}
+    )
+    receiver = WebhookReceiver(authentication=auth, service="stripe")
+    body = json.dumps({"id": "evt_1", "type": "invoice.paid"}).encode()
+    timestamp = str(int(time.time()))
+    signature = hmac.new(
+        b"whsec_test", timestamp.encode() + b"." + body, hashlib.sha256
+    ).hexdigest()
+
+    verify = receiver.authenticator.verify
+    assert verify({"stripe-signature": f"t={timestamp},v1={signature}"}, body)
+    assert not verify({"stripe-signature": f"t={timestamp},v1={signature}"}, b"{}")
+    assert not verify({"stripe-signature": f"t=1,v1={signature}"}, body)
+
+
+def test_unverifiable_service_authentication_is_rejected():
+    auth = SourceAuthentication(
+        enabled=True, type="service", service={"secret": "secret"}
+    )
+    with pytest.raises(ValueError):
+        WebhookReceiver(authentication=auth, service="paypal")
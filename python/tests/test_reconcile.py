@@ -0,0 +1,85 @@
+import json
+from httpx import Response
+from kyrazo.reconcile import DesiredState, Reconciler
+from kyrazo.resources.targets import CreateTargetInput
+
+CONFIG = {"timeout": 5000, "retryCount": 3, "rateLimitDuration": 60}
+
+
+def target(target_id, name, url):
+    return {
+        "_id": target_id,
+        "name": name,
+        "url": url,
+        "method": "POST",
+        "enabled": True,
+        "config": {**CONFIG, "rateLimit": None},
+        "customHeaders": None,
+        "createdAt": "2024-01-01T00:00:00Z",
+        "updatedAt": "2024-01-01T00:00:00Z",
+    }
+
+
+def desired_target(name, url):
+    return CreateTargetInput(name=name, url=url, config=CONFIG)
+
+
+def test_plan_and_apply_minimal_changes(client, mock_api):
+    project_id = "proj_123"
+    mock_api.get(f"/v1/targets/{project_id}", params={"page": "1"}).mock(
+        return_value=Response(
+            200,
+            json={
+                "data": [
+                    target("tgt_1", "same", "https://example.com/same"),
+                    target("tgt_2", "moved", "https://example.com/old"),
+                    target("tgt_3", "stale", "https://example.com/stale"),
+                ],
+                "pagination": {"page": 1, "pages": 1},
+            },
+        )
+    )
+    create = mock_api.post(f"/v1/targets/{project_id}").mock(
+        return_value=Response(
+            201, json={"data": target("tgt_4", "new", "https://example.com/new")}
+        )
+    )
+    update = mock_api.patch(f"/v1/targets/{project_id}/tgt_2").mock(
+        return_value=Response(
+            200, json={"data": target("tgt_2", "moved", "https://example.com/new")}
+        )
+    )
+    delete = mock_api.delete(f"/v1/targets/{project_id}/tgt_3").mock(
+        return_value=Response(200, json={"success": True})
+    )
+
+    reconciler = Reconciler(client, project_id, prune=True)
+    plan = reconciler.plan(
+        DesiredState(
+            targets=[
+                desired_target("same", "https://example.com/same"),
+                desired_target("moved", "https://example.com/new"),
+                desired_target("new", "https://example.com/new"),
+            ]
+        )
+    )
+
+    assert plan.summary() == {"create": 1, "update": 1, "delete": 1, "unchanged": 1}
+
+    result = reconciler.apply(plan)
+
+    assert len(result.applied) == 3
+    assert result.failed == []
+    assert json.loads(update.calls.last.request.content) == {
+        "url": "https://example.com/new"
+    }
+    assert json.loads(create.calls.last.request.content)["name"] == "new"
+    assert delete.called
+
+
+def test_unmanaged_kinds_are_not_fetched(client, mock_api):
+    reconciler = Reconciler(client, "proj_123")
+
+    plan = reconciler.plan(DesiredState())
+
+    assert plan.is_empty
@@ -0,0 +1,70 @@
+import json
+from httpx import Response
+from kyrazo import Kyrazo, TrafficRecorder
+from kyrazo.core.recorder import path_template
+from kyrazo.replay import StandInServer, TrafficReplayer, load_records
+
+
+def test_path_template():
+    assert path_template("/v1/targets/proj_1/tgt_2/secret") == (
+        "/v1/targets/{project_id}/{id}/secret"
+    )
+    assert path_template("/v1/events/proj_1/publish/batch") == (
+        "/v1/events/{project_id}/publish/batch"
+    )
+
+
+def test_record_and_replay(tmp_path):
+    log = str(tmp_path / "traffic.log")
+    recorder = TrafficRecorder(log)
+
+    with StandInServer() as server:
+        with Kyrazo(
+            api_key="sk_live_123", base_url=server.url, recorder=recorder
+        ) as client:
+            client._http_client.post(
+                "/v1/events/proj_1/publish",
+                content=b'{"eventType":"a"}',
+                headers={"Idempotency-Key": "k1"},
+            )
+            client.targets.get_secret("proj_1", "tgt_1")
+        recorder.close()
+
+        records = load_records(log)
+        assert [record["p"] for record in records] == [
+            "/v1/events/{project_id}/publish",
+            "/v1/targets/{project_id}/{id}/secret",
+        ]
+        assert records[0]["b"] == 17
+        assert records[0]["s"] == 200
+        assert records[0]["h"]["authorization"] == "[REDACTED]"
+        assert records[0]["h"]["idempotency-key"] == "k1"
+        assert "sk_live_123" not in json.dumps(records)
+
+        with Kyrazo(api_key="replay", base_url=server.url) as client:
+            report = TrafficReplayer(client, records * 5, rate=0).run().as_dict()
+
+    assert report["all"]["count"] == 10
+    assert report["all"]["errors"] == 0
+    assert report["POST /v1/events/{project_id}/publish"]["count"] == 5
+
+
+def test_replay_sends_fresh_idempotency_keys(mock_api):
+    route = mock_api.post("/v1/events/proj_replay/publish").mock(
+        return_value=Response(200, json={"success": True})
+    )
+    record = {
+        "t": 0,
+        "m": "POST",
+        "p": "/v1/events/{project_id}/publish",
+        "b": 10,
+        "h": {"idempotency-key": "k1"},
+        "s": 200,
+    }
+
+    with Kyrazo(api_key="replay", base_url="https://api.kyrazo.com") as client:
+        TrafficReplayer(client, [record, record], rate=0).run()
+
+    keys = {call.request.headers["Idempotency-Key"] for call in route.calls}
+    assert len(keys) == 2
+    assert "k1" not in keys
@@ -0,0 +1,86 @@
+import time
+import httpx
+import respx
+from httpx import Response
+from kyrazo import HedgePolicy, Kyrazo
+from kyrazo.core.routing import EndpointRouter
+
+PRIMARY = "https://eu.api.kyrazo.com"
+SECONDARY = "https://us.api.kyrazo.com"
+
+
+def test_router_prefers_faster_endpoint():
+    router = EndpointRouter([PRIMARY, SECONDARY])
+    router.record(PRIMARY, 0.3, ok=True)
+    router.record(SECONDARY, 0.05, ok=True)
+
+    assert router.order() == [SECONDARY, PRIMARY]
+
+
+def test_router_demotes_and_reprobes_failing_endpoint():
+    router = EndpointRouter([PRIMARY, SECONDARY], max_failures=2, cooldown=0.05)
+    for _ in range(2):
+        router.record(PRIMARY, 0.01, ok=False)
+
+    assert router.order() == [SECONDARY, PRIMARY]
+    assert router.snapshot()[0]["demoted"]
+
+    time.sleep(0.06)
+    # One request probes the endpoint, the next one waits for its outcome
+    assert router.order() == [PRIMARY, SECONDARY]
+    assert router.order() == [SECONDARY, PRIMARY]
+
+    router.record(PRIMARY, 0.01, ok=True)
+    assert router.snapshot()[0]["demotions"] == 0
+
+
+def test_failover_keeps_idempotency_key(api_key):
+    with respx.mock() as mock:
+        primary = mock.post(f"{PRIMARY}/v1/events/proj_123/publish").mock(
+            return_value=Response(503, json={"error": {"message": "Unavailable"}})
+        )
+        secondary = mock.post(f"{SECONDARY}/v1/events/proj_123/publish").mock(
+            return_value=Response(200, json={"success": True, "data": {}})
+        )
+        client = Kyrazo(api_key=api_key, base_url=[PRIMARY, SECONDARY])
+        client._http_client.post("/v1/events/proj_123/publish", data={})
+
+    sent_key = primary.calls.last.request.headers["Idempotency-Key"]
+    assert sent_key
+    assert secondary.calls.last.request.headers["Idempotency-Key"] == sent_key
+    assert client.stats["failovers"] == 1
+
+
+def test_failover_on_connection_error(api_key):
+    with respx.mock() as mock:
+        mock.get(f"{PRIMARY}/v1/test").mock(side_effect=httpx.ConnectError("down"))
+        mock.get(f"{SECONDARY}/v1/test").mock(
+            return_value=Response(200, json={"data": "ok"})
+        )
+        client = Kyrazo(api_key=api_key, base_url=[PRIMARY, SECONDARY])
+
+        assert client._http_client.get("/v1/test") == {"data": "ok"}
+        assert client.endpoint_health[0]["error_rate"] > 0
+
+
+def test_generated_idempotency_key_does_not_enable_hedging(api_key):
+    calls = []
+
+    def slow_create(request):
+        calls.append(request)
+        time.sleep(0.2)
+        return Response(200, json={"data": {}})
+
+    with respx.mock() as mock:
+        mock.post(f"{PRIMARY}/v1/targets/proj_123").mock(side_effect=slow_create)
+        client = Kyrazo(
+            api_key=api_key,
+            base_url=[PRIMARY, SECONDARY],
+            hedge=HedgePolicy(min_delay=0.01, max_delay=0.05),
+        )
+        client._http_client.post("/v1/targets/proj_123", data={})
+        client.close()
+
+    assert len(calls) == 1
+    assert calls[0].headers["Idempotency-Key"]
+    assert "hedges" not in client.stats